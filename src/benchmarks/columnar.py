@@ -0,0 +1,56 @@
+"""
+Compare encoding/decoding a list of records row by row against the columnar format from
+``encode.encode_columnar()`` and ``decode.decode_columnar()``.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.columnar
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from dataclasses import dataclass
+
+from dataclass_extensions import decode, encode
+
+
+@dataclass
+class Record:
+    id: int
+    name: str
+    score: float
+    label: str | None = None
+
+
+def main(size: int = 100_000, repeat: int = 5):
+    records = [Record(i, f"record{i}", i / 3, None if i % 2 else "a") for i in range(size)]
+    rows = encode(records)
+    columns = encode.encode_columnar(records)
+    assert decode.decode_columnar(Record, columns) == records
+
+    def timed(fn) -> float:
+        return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+    print(f"records ({size:,})")
+    print(f"  JSON size, rows:              {len(json.dumps(rows)) / 2**20:>8.1f} MiB")
+    print(f"  JSON size, columns:           {len(json.dumps(columns)) / 2**20:>8.1f} MiB")
+    encode_rows = timed(lambda: encode(records))
+    encode_columns = timed(lambda: encode.encode_columnar(records))
+    print(f"  encode(), rows:               {size / encode_rows:>10,.0f} records/s")
+    print(
+        f"  encode_columnar():            {size / encode_columns:>10,.0f} records/s "
+        f"({encode_rows / encode_columns:.2f}x)"
+    )
+    decode_rows = timed(lambda: decode.decode_many(Record, rows))
+    decode_columns = timed(lambda: decode.decode_columnar(Record, columns))
+    print(f"  decode_many(), rows:          {size / decode_rows:>10,.0f} records/s")
+    print(
+        f"  decode_columnar():            {size / decode_columns:>10,.0f} records/s "
+        f"({decode_rows / decode_columns:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
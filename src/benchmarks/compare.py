@@ -0,0 +1,170 @@
+"""
+Compare benchmark results from :mod:`benchmarks.suite` against a baseline and report the
+tracked metrics that got worse by more than a threshold.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.compare benchmarks/baseline.json results.json --threshold 0.25
+
+Exits with a non-zero status if there are any regressions.
+
+Latencies are divided by the calibration time measured right before each benchmark, so a
+baseline from one machine can be compared against results from a faster or slower one. A
+latency only counts as a regression if it's worse by more than the threshold *and* by more
+than the noise in either run, which is estimated from the spread between the median and the
+90th percentile. Peak memory doesn't depend on the speed of the machine or on noise, but
+differences smaller than ``MEMORY_FLOOR_BYTES`` are ignored.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_METRICS = ("latency_us.p50", "peak_memory_bytes")
+DEFAULT_THRESHOLD = 0.25
+MEMORY_FLOOR_BYTES = 4096
+
+
+@dataclass
+class Comparison:
+    """
+    The comparison of one metric of one benchmark against the baseline.
+    """
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    ratio: float
+    """The ratio of the current value to the baseline, normalized for latencies."""
+    allowed_ratio: float
+    """The largest ratio that isn't a regression, taking noise into account."""
+
+    @property
+    def is_regression(self) -> bool:
+        return self.ratio > self.allowed_ratio
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name} {self.metric}: {self.baseline:,.1f} -> {self.current:,.1f} "
+            f"({self.ratio:.2f}x, allowed {self.allowed_ratio:.2f}x)"
+        )
+
+
+def load(path: str) -> dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def get_metric(result: dict[str, Any], metric: str) -> float:
+    value: Any = result
+    for key in metric.split("."):
+        value = value[key]
+    return float(value)
+
+
+def has_metric(result: dict[str, Any], metric: str) -> bool:
+    try:
+        get_metric(result, metric)
+    except KeyError:
+        return False
+    return True
+
+
+def relative_noise(result: dict[str, Any]) -> float:
+    latency = result["latency_us"]
+    return max(latency["p90"] - latency["p50"], 0.0) / latency["p50"] if latency["p50"] else 0.0
+
+
+def compare_benchmark(
+    name: str,
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    metrics: tuple[str, ...] = DEFAULT_METRICS,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Comparison]:
+    baseline_calibration = baseline["calibration_us"]
+    current_calibration = current["calibration_us"]
+    comparisons = []
+    for metric in metrics:
+        if not has_metric(baseline, metric):
+            # e.g. the import time benchmark has no peak memory.
+            continue
+        baseline_value = get_metric(baseline, metric)
+        current_value = get_metric(current, metric)
+        allowed_ratio = 1.0 + threshold
+        if metric.startswith("latency_us."):
+            ratio = (current_value / current_calibration) / (baseline_value / baseline_calibration)
+            noise = max(relative_noise(baseline), relative_noise(current))
+            allowed_ratio = max(allowed_ratio, 1.0 + noise)
+        elif metric == "peak_memory_bytes" and current_value - baseline_value < MEMORY_FLOOR_BYTES:
+            ratio = 1.0
+        else:
+            ratio = current_value / baseline_value if baseline_value else 1.0
+        comparisons.append(
+            Comparison(name, metric, baseline_value, current_value, ratio, allowed_ratio)
+        )
+    return comparisons
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    metrics: tuple[str, ...] = DEFAULT_METRICS,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Comparison]:
+    """
+    Compare the tracked ``metrics`` of every benchmark that's in both sets of results.
+    """
+    comparisons = []
+    for name, result in current["benchmarks"].items():
+        if name in baseline["benchmarks"]:
+            comparisons.extend(
+                compare_benchmark(
+                    name,
+                    baseline["benchmarks"][name],
+                    result,
+                    metrics=metrics,
+                    threshold=threshold,
+                )
+            )
+    return comparisons
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark results against a baseline.")
+    parser.add_argument("baseline", help="Path to the baseline results.")
+    parser.add_argument("current", help="Path to the results to check.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="The fraction by which a metric can get worse before it's a regression.",
+    )
+    parser.add_argument(
+        "--metric",
+        action="append",
+        dest="metrics",
+        help=f"A metric to check, can be given more than once. Defaults to {DEFAULT_METRICS}.",
+    )
+    args = parser.parse_args(argv)
+
+    comparisons = compare(
+        load(args.baseline),
+        load(args.current),
+        metrics=tuple(args.metrics or DEFAULT_METRICS),
+        threshold=args.threshold,
+    )
+    regressions = [c for c in comparisons if c.is_regression]
+    for comparison in regressions:
+        print(f"REGRESSION {comparison}")
+    print(f"{len(comparisons)} metrics compared, {len(regressions)} regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
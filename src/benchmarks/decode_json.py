@@ -0,0 +1,64 @@
+"""
+Compare ``decode(cls, json.loads(text))`` against ``decode.decode_json()``, which uses
+``orjson`` to parse the JSON when it's installed.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.decode_json
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from dataclasses import dataclass, field
+
+from dataclass_extensions import decode, encode
+
+
+@dataclass
+class Auth:
+    user: str
+    token: str
+    scopes: list[str]
+
+
+@dataclass
+class Request:
+    id: int
+    method: str
+    auth: Auth
+    params: dict[str, str] = field(default_factory=dict)
+    values: list[float] = field(default_factory=list)
+    timeout: float | None = None
+
+
+def main(size: int = 20_000, repeat: int = 5):
+    request = Request(
+        id=1,
+        method="predict",
+        auth=Auth("user", "secret", ["read", "write"]),
+        params={"model": "small"},
+        values=[i / 3 for i in range(64)],
+        timeout=1.5,
+    )
+    bodies = [encode.encode_json(request).encode() for _ in range(size)]
+    assert decode.decode_json(Request, bodies[0]) == request
+
+    print(f"request bodies ({size:,})")
+    baseline = None
+    for name, fn in (
+        ("decode(json.loads())", lambda: [decode(Request, json.loads(b)) for b in bodies]),
+        ("decode.decode_json()", lambda: [decode.decode_json(Request, b) for b in bodies]),
+        (
+            "decode_json(trusted=True)",
+            lambda: [decode.decode_json(Request, b, trusted=True) for b in bodies],
+        ),
+    ):
+        elapsed = min(timeit.repeat(fn, number=1, repeat=repeat))
+        baseline = baseline or elapsed
+        print(f"  {name + ':':<28}{size / elapsed:>10,.0f} bodies/s ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare ``decode.decode_many()`` against calling ``decode()`` in a loop.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.decode_many
+"""
+
+from __future__ import annotations
+
+import timeit
+from dataclasses import dataclass
+
+from dataclass_extensions import Registrable, decode
+
+
+@dataclass
+class Row:
+    id: int
+    name: str
+    score: float
+    tags: list[str]
+    parent: int | None = None
+
+
+@dataclass
+class Event(Registrable):
+    id: int
+
+
+@Event.register("click")
+@dataclass
+class Click(Event):
+    x: int
+    y: int
+
+
+@Event.register("view")
+@dataclass
+class View(Event):
+    page: str
+
+
+def compare(name: str, cls, rows: list[dict], repeat: int = 5):
+    assert decode.decode_many(cls, rows) == [decode(cls, row) for row in rows]
+    loop = min(timeit.repeat(lambda: [decode(cls, row) for row in rows], number=1, repeat=repeat))
+    batch = min(timeit.repeat(lambda: decode.decode_many(cls, rows), number=1, repeat=repeat))
+    print(f"{name} ({len(rows):,} rows)")
+    print(f"  decode() loop: {len(rows) / loop:>12,.0f} rows/s")
+    print(f"  decode_many(): {len(rows) / batch:>12,.0f} rows/s ({loop / batch:.2f}x)")
+
+
+def main(size: int = 100_000):
+    compare(
+        "dataclass",
+        Row,
+        [
+            {"id": i, "name": f"row{i}", "score": i / 3, "tags": ["a", "b"], "parent": i - 1}
+            for i in range(size)
+        ],
+    )
+    compare(
+        "registrable",
+        Event,
+        [
+            {"type": "click", "id": i, "x": i, "y": -i}
+            if i % 2
+            else {"type": "view", "id": i, "page": "/"}
+            for i in range(size)
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare decoding with compiled decode plans, with and without code generation, against
+the generic recursive ``_coerce()`` path.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.decode_plans
+"""
+
+from __future__ import annotations
+
+import timeit
+from dataclasses import dataclass, field
+from typing import Any
+
+from dataclass_extensions import Registrable, decode, encode
+from dataclass_extensions.decode import Decoder, _coerce, _get_type_hints
+
+
+@dataclass
+class Optimizer(Registrable):
+    lr: float = 1e-3
+
+
+@Optimizer.register("adam")
+@dataclass
+class Adam(Optimizer):
+    betas: tuple[float, float] = (0.9, 0.999)
+    eps: float = 1e-8
+
+
+@dataclass
+class Layer:
+    name: str
+    width: int
+    dropout: float | None = None
+    activations: list[str] = field(default_factory=lambda: ["relu", "gelu"])
+
+
+@dataclass
+class Config:
+    name: str
+    seed: int
+    optimizer: Optimizer
+    layers: list[Layer]
+    tags: dict[str, str]
+    schedule: tuple[int, ...]
+    notes: str | None = None
+
+
+def decode_generic(config_class: Any, data: dict[str, Any]) -> Any:
+    """
+    Decode through the generic recursive path, like ``decode()`` did before decode plans.
+    """
+    type_hints = _get_type_hints(config_class)
+    kwargs = {
+        k: _coerce(v, type_hints[k], decode.custom_handlers, k, config_class)
+        for k, v in data.items()
+    }
+    return config_class(**kwargs)
+
+
+def main(number: int = 2_000, repeat: int = 5):
+    data = encode(
+        Config(
+            name="run1",
+            seed=42,
+            optimizer=Adam(lr=3e-4),
+            layers=[Layer(name=f"layer{i}", width=256 * (i + 1), dropout=0.1) for i in range(8)],
+            tags={"team": "research", "owner": "me"},
+            schedule=tuple(range(0, 10_000, 1_000)),
+        )
+    )
+    codegen_decode = Decoder(codegen=True)
+    assert decode(Config, data) == decode_generic(Config, data) == codegen_decode(Config, data)
+
+    generic = min(timeit.repeat(lambda: decode_generic(Config, data), number=number, repeat=repeat))
+    planned = min(timeit.repeat(lambda: decode(Config, data), number=number, repeat=repeat))
+    codegen = min(timeit.repeat(lambda: codegen_decode(Config, data), number=number, repeat=repeat))
+
+    print(f"generic _coerce(): {number / generic:>10,.0f} decodes/s")
+    print(f"decode plans:      {number / planned:>10,.0f} decodes/s ({generic / planned:.2f}x)")
+    print(f"codegen:           {number / codegen:>10,.0f} decodes/s ({generic / codegen:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compare ``decode()`` against ``decode(..., trusted=True)`` on data that came from ``encode()``.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.decode_trusted
+"""
+
+from __future__ import annotations
+
+import timeit
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+from dataclass_extensions import decode, encode
+
+
+class Activation(Enum):
+    relu = "relu"
+    gelu = "gelu"
+
+
+@dataclass
+class Layer:
+    name: str
+    width: int
+    activation: Activation
+    dropout: float | None = None
+
+
+@dataclass
+class Model:
+    name: str
+    layers: list[Layer]
+    created: datetime
+    metadata: dict[str, str]
+    lr: float = 1e-3
+    seed: int | None = None
+
+
+def main(size: int = 20_000, repeat: int = 5):
+    model = Model(
+        name="model",
+        layers=[Layer(f"layer{i}", 2**i, Activation.gelu, 0.1) for i in range(8)],
+        created=datetime(2024, 1, 1),
+        metadata={"author": "me"},
+        seed=0,
+    )
+    rows = [encode(model) for _ in range(size)]
+    assert decode(Model, rows[0], trusted=True) == decode(Model, rows[0]) == model
+
+    validated = min(
+        timeit.repeat(lambda: [decode(Model, row) for row in rows], number=1, repeat=repeat)
+    )
+    trusted = min(
+        timeit.repeat(
+            lambda: [decode(Model, row, trusted=True) for row in rows], number=1, repeat=repeat
+        )
+    )
+    print(f"nested model ({size:,} rows)")
+    print(f"  decode():               {size / validated:>10,.0f} rows/s")
+    print(f"  decode(trusted=True):   {size / trusted:>10,.0f} rows/s ({validated / trusted:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
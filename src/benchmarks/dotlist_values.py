@@ -0,0 +1,36 @@
+"""
+Compare parsing typical dotlist override values with the fast scalar parser that
+``merge_from_dotlist()`` uses against ``yaml.safe_load()``.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.dotlist_values
+"""
+
+from __future__ import annotations
+
+import timeit
+
+import yaml
+
+from dataclass_extensions.merge import _parse_value
+
+VALUES = ["0.001", "100", "true", "run1", "null", "-3", "1.0e-4", "data/train.jsonl", "[1, 2]"]
+
+
+def main(repeat: int = 5, number: int = 200):
+    assert [_parse_value(v) for v in VALUES] == [yaml.safe_load(v) for v in VALUES]
+
+    safe_load = min(
+        timeit.repeat(lambda: [yaml.safe_load(v) for v in VALUES], number=number, repeat=repeat)
+    )
+    fast = min(
+        timeit.repeat(lambda: [_parse_value(v) for v in VALUES], number=number, repeat=repeat)
+    )
+    print(f"parsing {len(VALUES)} override values")
+    print(f"  yaml.safe_load(): {safe_load / number * 1e6:>10,.1f} us")
+    print(f"  _parse_value():   {fast / number * 1e6:>10,.1f} us ({safe_load / fast:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measure ``encode()`` and ``encode.encode_json()`` on a config with large containers of
+primitives, which are copied in bulk (or reused with ``reuse_containers=True``) instead of
+encoded item by item.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.encode_containers
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from dataclasses import dataclass
+
+
+@dataclass
+class Payload:
+    values: list[float]
+    counts: dict[str, int]
+
+
+def main(size: int = 1_000_000, repeat: int = 5):
+    from dataclass_extensions import encode
+
+    payload = Payload(
+        values=[i / 3 for i in range(size)], counts={str(i): i for i in range(size // 10)}
+    )
+
+    def timed(fn) -> float:
+        return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+    print(f"payload with {size + size // 10:,} primitives")
+    print(f"  encode():                       {timed(lambda: encode(payload)):>8.1f} ms")
+    print(
+        f"  encode(reuse_containers=True):  "
+        f"{timed(lambda: encode(payload, reuse_containers=True)):>8.1f} ms"
+    )
+    print(
+        f"  json.dumps(encode()):           {timed(lambda: json.dumps(encode(payload))):>8.1f} ms"
+    )
+    print(
+        f"  encode.encode_json():           {timed(lambda: encode.encode_json(payload)):>8.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Measure ``encode()`` on values that are handled by a custom handler registered for a base
+class, or that aren't handled at all, with many custom handlers registered.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.encode_dispatch
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from dataclass_extensions import encode
+
+
+class Tensor:
+    def __init__(self, value: float):
+        self.value = value
+
+
+class CudaTensor(Tensor):
+    pass
+
+
+class Opaque:
+    def __str__(self) -> str:
+        return "opaque"
+
+
+def main(size: int = 100_000, num_handlers: int = 40, repeat: int = 5):
+    for i in range(num_handlers):
+        encode.register_encoder(str, type(f"Unrelated{i}", (), {}))
+    encode.register_encoder(lambda t: t.value, Tensor)
+
+    print(f"{num_handlers + 1} custom handlers registered ({size:,} values)")
+    for name, values in (
+        ("subclass of registered type", [CudaTensor(i) for i in range(size)]),
+        ("unhandled, errors='stringify'", [Opaque() for _ in range(size)]),
+    ):
+        elapsed = min(
+            timeit.repeat(lambda: encode(values, errors="stringify"), number=1, repeat=repeat)
+        )
+        print(f"  {name + ':':<32}{size / elapsed:>12,.0f} values/s")
+
+
+if __name__ == "__main__":
+    main()
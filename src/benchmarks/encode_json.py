@@ -0,0 +1,69 @@
+"""
+Compare ``json.dumps(encode(...))`` against ``encode.encode_json()`` and
+``encode.encode_to()`` for a large result dump, in time and peak memory.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.encode_json
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import timeit
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable
+
+from dataclass_extensions import encode
+
+
+@dataclass
+class Metric:
+    name: str
+    value: float
+    step: int
+    tags: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Results:
+    run: str
+    metrics: list[Metric]
+
+
+def write_to_devnull(results: Results):
+    with open(os.devnull, "w") as fp:
+        encode.encode_to(results, fp)
+
+
+def peak_memory(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(size: int = 100_000, repeat: int = 3):
+    results = Results(
+        run="run",
+        metrics=[Metric("loss", i / 7, i, {"split": "train"}) for i in range(size)],
+    )
+    assert encode.encode_json(results) == json.dumps(encode(results))
+
+    print(f"results with {size:,} metrics")
+    for name, fn in (
+        ("json.dumps(encode())", lambda: json.dumps(encode(results))),
+        ("encode.encode_json()", lambda: encode.encode_json(results)),
+        ("encode.encode_to()", lambda: write_to_devnull(results)),
+    ):
+        elapsed = min(timeit.repeat(fn, number=1, repeat=repeat))
+        peak = peak_memory(fn)
+        print(f"  {name + ':':<24}{elapsed * 1000:>8,.0f} ms, peak {peak / 2**20:>6,.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
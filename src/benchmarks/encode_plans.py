@@ -0,0 +1,59 @@
+"""
+Measure ``encode()`` throughput on small dataclasses, like telemetry events, compared
+to ``dataclasses.asdict()``.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.encode_plans
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import timeit
+from dataclasses import dataclass
+
+from dataclass_extensions import Registrable, encode
+
+
+@dataclass
+class Span(Registrable):
+    name: str
+    duration: float
+    tags: dict[str, str]
+    parent: int | None = None
+    _internal: int = 0
+
+
+@Span.register("db")
+@dataclass
+class DbSpan(Span):
+    query: str = ""
+
+
+def main(size: int = 100_000, repeat: int = 5):
+    spans = [
+        DbSpan(name=f"span{i}", duration=i / 10, tags={"host": "a"}, query="select 1")
+        for i in range(size)
+    ]
+    asdict = min(
+        timeit.repeat(lambda: [dataclasses.asdict(s) for s in spans], number=1, repeat=repeat)
+    )
+    print(f"small registrable dataclass ({size:,} instances)")
+    print(f"  {'dataclasses.asdict():':<24}{size / asdict:>10,.0f} instances/s")
+    for exclude in (False, True):
+        elapsed = min(
+            timeit.repeat(
+                lambda: [
+                    encode(s, exclude_none=exclude, exclude_private_fields=exclude) for s in spans
+                ],
+                number=1,
+                repeat=repeat,
+            )
+        )
+        label = "encode(exclude_*=True):" if exclude else "encode():"
+        print(f"  {label:<24}{size / elapsed:>10,.0f} instances/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measure the effect of caching resolved forward references when coercing large lists
+annotated with string type hints, e.g. ``list["Item"]``.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.forward_refs
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from unittest import mock
+
+from dataclass_extensions import decode
+from dataclass_extensions.decode import _coerce, _evaluate_forward_ref, _get_type_hints
+
+
+@dataclass
+class Item:
+    name: str
+    value: float
+
+
+@dataclass
+class Collection:
+    items: list["Item"]
+
+
+def main(size: int = 10_000):
+    items = [{"name": f"item{i}", "value": i * 0.5} for i in range(size)]
+    type_hint = _get_type_hints(Collection)["items"]  # list['Item']
+
+    def run() -> float:
+        start = time.perf_counter()
+        _coerce(items, type_hint, decode.custom_handlers, "items", Collection)
+        return time.perf_counter() - start
+
+    decode.clear_cache()
+    cached = min(run() for _ in range(3))
+
+    # Emulate the old behavior by evaluating the forward reference on every item.
+    with mock.patch(
+        "dataclass_extensions.decode._resolve_type_hint",
+        side_effect=lambda hint, owner: _evaluate_forward_ref(hint, owner)
+        if isinstance(hint, str)
+        else hint,
+    ):
+        uncached = min(run() for _ in range(3))
+
+    print(f"coercing list['Item'] with {size:,} items")
+    print(f"uncached: {uncached * 1000:>8.1f} ms")
+    print(f"cached:   {cached * 1000:>8.1f} ms ({uncached / cached:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Measure how long ``import dataclass_extensions`` takes in a fresh interpreter with
+``python -X importtime``, and check that none of the slow optional dependencies are
+imported along with it.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.importtime
+
+Exits with a non-zero status if any of the modules in ``DEFERRED_MODULES`` are imported.
+
+Imports are measured with compiled bytecode cached in a temporary directory, like an installed
+package would have, even if ``PYTHONDONTWRITEBYTECODE`` is set. Otherwise the measurements
+would mostly be of compiling the source. Each import is paired with an import of
+``REFERENCE_MODULES`` from the standard library, which is used as the calibration time so that
+import times can be compared between machines.
+
+The import time is also part of :mod:`benchmarks.suite`, as the ``import/dataclass_extensions``
+benchmark, so it's checked against the baseline by ``make bench-check``.
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+# Modules that should only be imported when they're actually needed.
+DEFERRED_MODULES = ("yaml", "pathlib", "orjson", "numpy")
+
+# Standard library modules that are slow enough to import to calibrate import times against.
+REFERENCE_MODULES = (
+    "argparse",
+    "decimal",
+    "email.message",
+    "logging",
+    "tomllib",
+    "xml.dom.minidom",
+)
+
+
+def import_times(
+    module: str = "dataclass_extensions", env: dict[str, str] | None = None
+) -> dict[str, int]:
+    """
+    Import ``module``, or a comma-separated list of modules, in a fresh interpreter and return
+    the cumulative import time of every module that was imported, in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(repeat: int = 20, module: str = "dataclass_extensions") -> dict[str, Any]:
+    """
+    Import ``module`` in ``repeat`` fresh interpreters, after one more to compile the
+    bytecode, and summarize the cumulative import times like :func:`benchmarks.suite.measure()`.
+    The median import time of ``REFERENCE_MODULES`` is included as ``calibration_us``.
+    """
+    from .suite import summarize
+
+    reference = ", ".join(REFERENCE_MODULES)
+    with tempfile.TemporaryDirectory() as pycache_prefix:
+        env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+        env["PYTHONPYCACHEPREFIX"] = pycache_prefix
+        import_times(module, env=env)
+        import_times(reference, env=env)
+
+        latencies: list[float] = []
+        reference_latencies: list[float] = []
+        imported: set[str] = set()
+        total = 0.0
+        for _ in range(repeat):
+            # Interleave the runs so that they're affected by noise in the same way.
+            reference_times = import_times(reference, env=env)
+            reference_latencies.append(float(sum(reference_times[m] for m in REFERENCE_MODULES)))
+            start = time.perf_counter()
+            times = import_times(module, env=env)
+            total += time.perf_counter() - start
+            latencies.append(float(times[module]))
+            imported.update(times)
+
+    result = summarize(latencies, total)
+    result["calibration_us"] = statistics.median(reference_latencies)
+    result["deferred_modules_imported"] = [name for name in DEFERRED_MODULES if name in imported]
+    return result
+
+
+def main(repeat: int = 20) -> int:
+    result = measure(repeat)
+    latency = result["latency_us"]
+    print(f"import dataclass_extensions ({repeat} runs)")
+    print(f"  median: {latency['p50'] / 1e3:>6.1f} ms")
+    print(f"  min:    {latency['min'] / 1e3:>6.1f} ms")
+
+    imported = result["deferred_modules_imported"]
+    if imported:
+        print(f"  imported deferred modules: {', '.join(imported)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
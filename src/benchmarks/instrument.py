@@ -0,0 +1,83 @@
+"""
+Measure the overhead of the instrumentation in :mod:`dataclass_extensions.instrument` on
+``encode()`` and ``decode()``, with no listeners and with a :class:`Metrics` listener.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.instrument
+"""
+
+from __future__ import annotations
+
+import timeit
+from dataclasses import dataclass
+
+from dataclass_extensions import decode, encode
+from dataclass_extensions.instrument import Metrics, add_listener, remove_listener
+
+
+@dataclass
+class Small:
+    x: int
+    y: float
+
+
+@dataclass
+class Item:
+    id: int
+    score: float
+    tags: list[str]
+
+
+@dataclass
+class Circle:
+    radius: float
+
+
+@dataclass
+class Square:
+    side: float
+
+
+@dataclass
+class Large:
+    name: str
+    items: list[Item]
+    shapes: list[Circle | Square]
+
+
+def main(repeat: int = 10, number: int = 2_000):
+    small = Small(1, 2.0)
+    large = Large(
+        name="large",
+        items=[Item(i, i / 3, ["a", "b"]) for i in range(100)],
+        shapes=[Circle(1.0) if i % 2 else Square(1.0) for i in range(100)],
+    )
+    operations = {
+        "encode small": lambda: encode(small),
+        "decode small": lambda: decode(Small, {"x": 1, "y": 2.0}),
+        "encode large": lambda: encode(large),
+        "decode large": (lambda data: lambda: decode(Large, data))(encode(large)),
+    }
+
+    metrics = Metrics()
+    # Interleave the runs so that they're all affected by noise in the same way.
+    timings: dict[tuple[str, bool], list[float]] = {}
+    for _ in range(repeat):
+        for enabled in (False, True):
+            if enabled:
+                add_listener(metrics)
+            for name, fun in operations.items():
+                n = number * 50 if "small" in name else number
+                timings.setdefault((name, enabled), []).append(timeit.timeit(fun, number=n) / n)
+            if enabled:
+                remove_listener(metrics)
+
+    print(f"{'':<14}{'disabled':>12}{'enabled':>12}")
+    for name in operations:
+        off, on = min(timings[(name, False)]), min(timings[(name, True)])
+        print(f"{name:<14}{off * 1e6:>9,.2f} us{on * 1e6:>9,.2f} us ({on / off:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Compare ``merge()``, which merges updates directly into the dataclass tree, against
+the round trip through ``encode()`` and ``decode()`` that it used to do.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.merge
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import timeit
+from typing import Any
+
+from dataclass_extensions import decode, encode, merge
+from dataclass_extensions.merge import _merge_dicts
+
+Section = dataclasses.make_dataclass(
+    "Section", [(f"field{i}", float, dataclasses.field(default=0.0)) for i in range(50)]
+)
+Config = dataclasses.make_dataclass(
+    "Config",
+    [(f"section{i}", Section, dataclasses.field(default_factory=Section)) for i in range(40)],
+)
+
+
+def merge_round_trip(instance: Any, *dicts: dict[str, Any]) -> Any:
+    current = encode(instance, errors="ignore")
+    for d in dicts:
+        current = _merge_dicts(current, d)
+    return decode(type(instance), current)
+
+
+def main(repeat: int = 5, number: int = 100):
+    config = Config()
+    updates = {"section3": {"field7": 1e-4}, "section20": {"field1": "2"}}
+    assert merge(config, updates) == merge_round_trip(config, updates)
+
+    round_trip = min(
+        timeit.repeat(lambda: merge_round_trip(config, updates), number=number, repeat=repeat)
+    )
+    structural = min(timeit.repeat(lambda: merge(config, updates), number=number, repeat=repeat))
+    print("merging 2 leaves into a config with 2,000 fields")
+    print(f"  encode/decode round trip: {round_trip / number * 1e6:>10,.0f} us")
+    print(
+        f"  merge():                  {structural / number * 1e6:>10,.0f} us "
+        f"({round_trip / structural:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
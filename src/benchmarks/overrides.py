@@ -0,0 +1,59 @@
+"""
+Compare applying dot-notation overrides with ``compile_overrides()`` against the round
+trip through ``encode()`` and ``decode()`` that ``merge_from_dotlist()`` used to do.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.overrides
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import timeit
+from typing import Any, Sequence
+
+from dataclass_extensions import compile_overrides, decode, encode
+from dataclass_extensions.merge import CompiledOverrides, _set_nested
+
+Section = dataclasses.make_dataclass(
+    "Section", [(f"field{i}", float, dataclasses.field(default=0.0)) for i in range(50)]
+)
+Config = dataclasses.make_dataclass(
+    "Config",
+    [(f"section{i}", Section, dataclasses.field(default_factory=Section)) for i in range(40)],
+)
+
+
+def override_round_trip(instance: Any, keys: Sequence[str], values: Sequence[Any]) -> Any:
+    current = encode(instance, errors="ignore")
+    for key, value in zip(keys, values):
+        _set_nested(current, key, value)
+    return decode(type(instance), current)
+
+
+def main(repeat: int = 5, number: int = 100):
+    config = Config()
+    keys = ["section3.field7", "section20.field1", "section39.field49"]
+    values = [1e-4, 2, 0.5]
+    overrides: CompiledOverrides[Any] = compile_overrides(Config, keys)
+    assert overrides.apply(config, values) == override_round_trip(config, keys, values)
+
+    round_trip = min(
+        timeit.repeat(
+            lambda: override_round_trip(config, keys, values), number=number, repeat=repeat
+        )
+    )
+    compiled = min(
+        timeit.repeat(lambda: overrides.apply(config, values), number=number, repeat=repeat)
+    )
+    print(f"applying {len(keys)} overrides to a config with 2,000 fields")
+    print(f"  encode/decode round trip:  {round_trip / number * 1e6:>10,.0f} us")
+    print(
+        f"  compile_overrides().apply: {compiled / number * 1e6:>10,.0f} us "
+        f"({round_trip / compiled:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
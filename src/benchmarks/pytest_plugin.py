@@ -0,0 +1,129 @@
+"""
+A pytest plugin that runs the benchmarks in :mod:`benchmarks.suite` and fails for each one
+whose tracked metrics regressed against a baseline file. Run from the ``src/`` directory with::
+
+    python -m pytest -p benchmarks.pytest_plugin benchmarks/baseline.json
+
+Any ``baseline*.json`` file that pytest is pointed at is collected as a set of benchmarks,
+one test per benchmark in the baseline. The benchmarks are run once for all of the tests,
+with the same ``--quick`` setting as the baseline. A benchmark that looks like it regressed
+is measured again up to ``--bench-retries`` times before it fails, since a single slow run
+is much more likely to be noise than a real regression.
+
+To update the baseline, run ``make bench-baseline``.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from . import suite
+from .compare import (
+    DEFAULT_METRICS,
+    DEFAULT_THRESHOLD,
+    Comparison,
+    compare_benchmark,
+    load,
+)
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("bench", "benchmark regression checks")
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="The fraction by which a metric can get worse before it's a regression.",
+    )
+    group.addoption(
+        "--bench-metric",
+        action="append",
+        dest="bench_metrics",
+        help=f"A metric to check, can be given more than once. Defaults to {DEFAULT_METRICS}.",
+    )
+    group.addoption(
+        "--bench-retries",
+        type=int,
+        default=2,
+        help="How many more times to measure a benchmark that looks like it regressed.",
+    )
+    group.addoption(
+        "--bench-min-time",
+        type=float,
+        default=None,
+        help="Minimum number of seconds to run each benchmark for.",
+    )
+
+
+def pytest_collect_file(file_path: Path, parent: pytest.Collector):
+    if file_path.suffix == ".json" and file_path.name.startswith("baseline"):
+        return BaselineFile.from_parent(parent, path=file_path)
+    return None
+
+
+class BenchmarkRegression(Exception):
+    def __init__(self, regressions: list[Comparison]):
+        super().__init__(regressions)
+        self.regressions = regressions
+
+
+class BaselineFile(pytest.File):
+    baseline: dict[str, Any]
+    _results: dict[str, Any] | None = None
+
+    def collect(self):
+        self.baseline = load(str(self.path))
+        for name in self.baseline["benchmarks"]:
+            yield BenchmarkItem.from_parent(self, name=name)
+
+    def run_benchmarks(self, names: list[str] | None = None) -> dict[str, Any]:
+        return suite.run(
+            quick=self.baseline["metadata"].get("quick", False),
+            names=names,
+            min_time=self.config.getoption("bench_min_time"),
+            verbose=False,
+        )
+
+    @property
+    def results(self) -> dict[str, Any]:
+        if self._results is None:
+            self._results = self.run_benchmarks(names=list(self.baseline["benchmarks"]))
+        return self._results
+
+
+class BenchmarkItem(pytest.Item):
+    parent: BaselineFile
+
+    def compare(self, results: dict[str, Any]) -> list[Comparison]:
+        if self.name not in results["benchmarks"]:
+            pytest.fail(f"Benchmark '{self.name}' is in the baseline but not in the suite")
+        return compare_benchmark(
+            self.name,
+            self.parent.baseline["benchmarks"][self.name],
+            results["benchmarks"][self.name],
+            metrics=tuple(self.config.getoption("bench_metrics") or DEFAULT_METRICS),
+            threshold=self.config.getoption("bench_threshold"),
+        )
+
+    def runtest(self):
+        regressions = [c for c in self.compare(self.parent.results) if c.is_regression]
+        for _ in range(self.config.getoption("bench_retries")):
+            if not regressions:
+                return
+            results = self.parent.run_benchmarks(names=[self.name])
+            # Only the metrics that regressed on every run count.
+            regressed = {c.metric for c in self.compare(results) if c.is_regression}
+            regressions = [c for c in regressions if c.metric in regressed]
+        if regressions:
+            raise BenchmarkRegression(regressions)
+
+    def repr_failure(self, excinfo, style=None):
+        if isinstance(excinfo.value, BenchmarkRegression):
+            return "\n".join(f"REGRESSION {c}" for c in excinfo.value.regressions)
+        return super().repr_failure(excinfo, style=style)
+
+    def reportinfo(self):
+        return self.path, None, f"benchmark: {self.name}"
@@ -0,0 +1,62 @@
+"""
+Compare ``Registrable.get_registered_name(subclass)``, which looks the name up in a
+reverse index, against the linear scan over the registry that it used to do.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.registered_name
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import timeit
+from typing import Type
+
+from dataclass_extensions import Registrable
+
+
+@dataclasses.dataclass
+class Plugin(Registrable):
+    pass
+
+
+SUBCLASSES: list[Type[Plugin]] = [
+    Plugin.register(f"plugin{i}")(dataclasses.make_dataclass(f"Plugin{i}", [], bases=(Plugin,)))
+    for i in range(500)
+]
+
+
+def get_registered_name_scan(cls: Type[Registrable], subclass: Type[Registrable]) -> str:
+    for name, registered_subclass in cls._registry.items():
+        if registered_subclass == subclass:
+            return name
+    raise ValueError(subclass)
+
+
+def main(repeat: int = 5, number: int = 200):
+    assert all(
+        Plugin.get_registered_name(c) == get_registered_name_scan(Plugin, c) for c in SUBCLASSES
+    )
+
+    scan = min(
+        timeit.repeat(
+            lambda: [get_registered_name_scan(Plugin, c) for c in SUBCLASSES],
+            number=number,
+            repeat=repeat,
+        )
+    )
+    indexed = min(
+        timeit.repeat(
+            lambda: [Plugin.get_registered_name(c) for c in SUBCLASSES],
+            number=number,
+            repeat=repeat,
+        )
+    )
+    print(f"looking up the names of {len(SUBCLASSES)} registered subclasses")
+    print(f"  linear scan:   {scan / number * 1e3:>8.3f} ms")
+    print(f"  reverse index: {indexed / number * 1e3:>8.3f} ms ({scan / indexed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
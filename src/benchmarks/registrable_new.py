@@ -0,0 +1,67 @@
+"""
+Compare instantiating a registered ``Registrable`` subclass, which skips the dispatch in
+``Registrable.__new__()``, against a plain dataclass and against going through the dispatch.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.registrable_new
+"""
+
+from __future__ import annotations
+
+import timeit
+from dataclasses import dataclass
+
+from dataclass_extensions import Registrable
+
+
+@dataclass
+class Plain:
+    x: int
+    y: float = 0.0
+
+
+@dataclass
+class Base(Registrable):
+    x: int
+    y: float = 0.0
+
+
+@Base.register("leaf")
+@dataclass
+class Leaf(Base):
+    pass
+
+
+@Base.register("dispatching")
+@dataclass
+class Dispatching(Base):
+    pass
+
+
+# How every registered subclass was instantiated before.
+Dispatching.__new__ = Registrable.__dict__["__new__"]  # type: ignore[method-assign]
+
+
+def main(repeat: int = 10, number: int = 200_000):
+    # Interleave the runs so that they're all affected by noise in the same way.
+    timings: dict[type, list[float]] = {Plain: [], Leaf: [], Dispatching: []}
+    for _ in range(repeat):
+        for cls, times in timings.items():
+            times.append(timeit.timeit(lambda: cls(1, y=2.0), number=number))
+    results = {cls: min(times) for cls, times in timings.items()}
+
+    print(f"creating {number:,} instances")
+    for cls, label in (
+        (Plain, "plain dataclass"),
+        (Leaf, "registered subclass"),
+        (Dispatching, "dispatching __new__()"),
+    ):
+        print(
+            f"  {label + ':':<23}{results[cls] * 1e3:>8,.0f} ms "
+            f"({results[cls] / results[Plain]:.1f}x plain)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Benchmark ``encode()``, ``decode()``, ``merge()``, and ``merge_from_dotlist()`` on synthetic
+dataclass schemas that vary in width, depth, union width, ``Registrable`` fan-out, and
+container size, and optionally save the results as JSON so that runs can be compared.
+
+The time it takes to import ``dataclass_extensions`` is measured too, as the
+``import/dataclass_extensions`` benchmark. See :mod:`benchmarks.importtime`.
+
+Run from the ``src/`` directory with::
+
+    python -m benchmarks.suite --output results.json
+
+Use ``--quick`` for a smaller, faster run and ``--filter`` to only run the benchmarks whose
+names contain a substring, e.g. ``--filter decode``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Collection, Union
+
+from dataclass_extensions import Registrable, decode, encode, merge, merge_from_dotlist
+from dataclass_extensions.version import VERSION
+
+from . import importtime
+
+OPERATIONS = ("encode", "decode", "merge", "merge_from_dotlist")
+
+
+@dataclass
+class Case:
+    """
+    A synthetic schema and an instance of it to benchmark each operation on.
+    """
+
+    name: str
+    params: dict[str, int]
+    cls: type
+    instance: Any
+    updates: dict[str, Any]
+    """Updates for :func:`merge()`, which should touch one of the most deeply nested fields."""
+    overrides: list[str]
+    """The same updates as overrides for :func:`merge_from_dotlist()`."""
+
+
+def make_nested_schema(width: int, depth: int) -> type:
+    """
+    Make a dataclass with ``width`` scalar fields, and a ``child`` field with the same shape
+    nested ``depth`` levels deep.
+    """
+    scalar_types = (int, float, str, bool)
+    cls: type | None = None
+    for level in reversed(range(depth + 1)):
+        fields: list[Any] = [
+            (f"field{i}", scalar_types[i % 4], dataclasses.field(default=scalar_types[i % 4]()))
+            for i in range(width)
+        ]
+        if cls is not None:
+            fields.append(("child", cls, dataclasses.field(default_factory=cls)))
+        cls = dataclasses.make_dataclass(f"Level{level}W{width}D{depth}", fields)
+    assert cls is not None
+    return cls
+
+
+def nested_case(width: int, depth: int) -> Case:
+    cls = make_nested_schema(width, depth)
+    path = ["child"] * depth + ["field1"]
+    updates: dict[str, Any] = {path[-1]: 0.5}
+    for key in reversed(path[:-1]):
+        updates = {key: updates}
+    return Case(
+        name=f"nested_w{width}_d{depth}",
+        params={"width": width, "depth": depth},
+        cls=cls,
+        instance=cls(),
+        updates=updates,
+        overrides=[f"{'.'.join(path)}=0.5"],
+    )
+
+
+def union_case(union_width: int, items: int) -> Case:
+    """
+    A list of values annotated with a union of ``union_width`` dataclasses with different
+    fields, using each member of the union in turn.
+    """
+    members = [
+        dataclasses.make_dataclass(f"Member{i}U{union_width}", [(f"value{i}", int), ("name", str)])
+        for i in range(union_width)
+    ]
+    member_type: Any = Union[tuple(members)]
+    cls = dataclasses.make_dataclass(
+        f"UnionHolder{union_width}",
+        [("values", list[member_type]), ("last", member_type)],  # type: ignore[valid-type]
+    )
+    values = [
+        members[i % union_width](**{f"value{i % union_width}": i, "name": "x"})
+        for i in range(items)
+    ]
+    last = union_width - 1
+    return Case(
+        name=f"union_u{union_width}",
+        params={"union_width": union_width, "items": items},
+        cls=cls,
+        instance=cls(values=values, last=members[last](**{f"value{last}": 0, "name": "x"})),
+        updates={"last": {f"value{last}": 1}},
+        overrides=[f"last.value{last}=1"],
+    )
+
+
+def registrable_case(fan_out: int, items: int) -> Case:
+    """
+    A list of values annotated with a ``Registrable`` base class that has ``fan_out``
+    registered subclasses, using each subclass in turn.
+    """
+
+    @dataclass
+    class Base(Registrable):
+        x: int = 0
+
+    subclasses: list[type[Base]] = [
+        Base.register(f"impl{i}")(
+            dataclasses.make_dataclass(f"Impl{i}F{fan_out}", [(f"y{i}", float, 0.0)], bases=(Base,))
+        )
+        for i in range(fan_out)
+    ]
+    cls = dataclasses.make_dataclass(
+        f"RegistrableHolder{fan_out}", [("values", list[Base]), ("last", Base)]
+    )
+    return Case(
+        name=f"registrable_f{fan_out}",
+        params={"fan_out": fan_out, "items": items},
+        cls=cls,
+        instance=cls(
+            values=[subclasses[i % fan_out](x=i) for i in range(items)],
+            last=subclasses[-1](x=0),
+        ),
+        updates={"last": {"x": 1}},
+        overrides=["last.x=1"],
+    )
+
+
+def container_case(size: int) -> Case:
+    """
+    Containers of primitives and of small dataclasses with ``size`` items each.
+    """
+    item_cls = dataclasses.make_dataclass(f"Item{size}", [("id", int), ("score", float)])
+    cls = dataclasses.make_dataclass(
+        f"Containers{size}",
+        [
+            ("floats", list[float]),
+            ("tags", dict[str, str]),
+            ("items", list[item_cls]),  # type: ignore[valid-type]
+            ("name", str),
+        ],
+    )
+    return Case(
+        name=f"containers_s{size}",
+        params={"size": size},
+        cls=cls,
+        instance=cls(
+            floats=[i / 3 for i in range(size)],
+            tags={f"tag{i}": str(i) for i in range(size)},
+            items=[item_cls(id=i, score=i / 7) for i in range(size)],
+            name="containers",
+        ),
+        updates={"name": "updated"},
+        overrides=["name=updated"],
+    )
+
+
+def make_cases(quick: bool = False) -> list[Case]:
+    if quick:
+        return [
+            nested_case(width=10, depth=2),
+            union_case(union_width=4, items=50),
+            registrable_case(fan_out=10, items=50),
+            container_case(size=100),
+        ]
+    return [
+        nested_case(width=5, depth=1),
+        nested_case(width=50, depth=1),
+        nested_case(width=200, depth=1),
+        nested_case(width=10, depth=5),
+        nested_case(width=10, depth=20),
+        union_case(union_width=2, items=200),
+        union_case(union_width=8, items=200),
+        union_case(union_width=32, items=200),
+        registrable_case(fan_out=4, items=200),
+        registrable_case(fan_out=64, items=200),
+        registrable_case(fan_out=512, items=200),
+        container_case(size=10),
+        container_case(size=1_000),
+        container_case(size=100_000),
+    ]
+
+
+def get_operation(case: Case, operation: str) -> Callable[[], Any]:
+    if operation == "encode":
+        return lambda: encode(case.instance)
+    elif operation == "decode":
+        data = encode(case.instance)
+        return lambda: decode(case.cls, data)
+    elif operation == "merge":
+        return lambda: merge(case.instance, case.updates)
+    elif operation == "merge_from_dotlist":
+        return lambda: merge_from_dotlist(case.instance, case.overrides)
+    else:
+        raise ValueError(f"Unknown operation '{operation}'")
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    index = (len(sorted_values) - 1) * q
+    lower = int(index)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (index - lower)
+
+
+def measure(fun: Callable[[], Any], min_time: float, min_calls: int) -> dict[str, Any]:
+    """
+    Call ``fun`` repeatedly for at least ``min_time`` seconds and ``min_calls`` calls, timing
+    each call, then call it once more with ``tracemalloc`` to measure its peak memory.
+    """
+    # Warm up caches, like decode plans.
+    for _ in range(3):
+        fun()
+
+    latencies: list[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        while len(latencies) < min_calls or time.perf_counter() - start < min_time:
+            call_start = time.perf_counter_ns()
+            fun()
+            latencies.append((time.perf_counter_ns() - call_start) / 1e3)
+        total = time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        fun()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = summarize(latencies, total)
+    result["peak_memory_bytes"] = peak_memory
+    return result
+
+
+def summarize(latencies: list[float], total: float) -> dict[str, Any]:
+    """
+    Summarize the latencies of a benchmark, in microseconds, that took ``total`` seconds.
+    """
+    latencies = sorted(latencies)
+    return {
+        "calls": len(latencies),
+        "ops_per_sec": len(latencies) / total,
+        "latency_us": {
+            "mean": statistics.fmean(latencies),
+            "stdev": statistics.stdev(latencies) if len(latencies) > 1 else 0.0,
+            "min": latencies[0],
+            "p50": percentile(latencies, 0.5),
+            "p90": percentile(latencies, 0.9),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1],
+        },
+    }
+
+
+def calibration_workload() -> Any:
+    data = {str(i): [i, i * 0.5, (i,)] for i in range(1_000)}
+    return sorted(data.items(), key=lambda item: item[1][1], reverse=True)
+
+
+def calibrate(rounds: int = 3, min_time: float = 0.02) -> float:
+    """
+    Measure the median latency, in microseconds, of a fixed pure-Python workload. Latencies
+    divided by this can be compared between machines of different speeds. The fastest of
+    several short rounds is used since it's the least affected by other load on the machine.
+    """
+    return min(
+        measure(calibration_workload, min_time, min_calls=5)["latency_us"]["p50"]
+        for _ in range(rounds)
+    )
+
+
+def run(
+    quick: bool = False,
+    name_filter: str | None = None,
+    names: Collection[str] | None = None,
+    min_time: float | None = None,
+    min_calls: int = 5,
+    verbose: bool = True,
+) -> dict[str, Any]:
+    """
+    Run the benchmarks and return the results, keyed by ``"<case>/<operation>"``.
+
+    :param name_filter: Only run the benchmarks whose names contain this.
+    :param names: Only run the benchmarks with these names.
+    """
+    if min_time is None:
+        min_time = 0.1 if quick else 0.5
+
+    benchmarks: dict[str, Any] = {}
+    for case in make_cases(quick=quick):
+        for operation in OPERATIONS:
+            name = f"{case.name}/{operation}"
+            if name_filter is not None and name_filter not in name:
+                continue
+            if names is not None and name not in names:
+                continue
+            # Calibrate right before each benchmark since the speed of the machine can change.
+            calibration = calibrate()
+            result = measure(get_operation(case, operation), min_time, min_calls)
+            result["calibration_us"] = calibration
+            benchmarks[name] = {"case": case.name, "operation": operation, "params": case.params}
+            benchmarks[name].update(result)
+            if verbose:
+                print(
+                    f"{name:<45} {result['ops_per_sec']:>12,.1f} ops/s  "
+                    f"p50 {result['latency_us']['p50']:>11,.1f} us  "
+                    f"p99 {result['latency_us']['p99']:>11,.1f} us  "
+                    f"peak {result['peak_memory_bytes'] / 1024:>10,.1f} KiB",
+                    flush=True,
+                )
+
+    name = "import/dataclass_extensions"
+    if (name_filter is None or name_filter in name) and (names is None or name in names):
+        # Calibrated against importing other modules instead of with 'calibrate()'.
+        result = importtime.measure(repeat=10 if quick else 25)
+        benchmarks[name] = {"case": "import", "operation": "import", "params": {}}
+        benchmarks[name].update(result)
+        if verbose:
+            print(
+                f"{name:<45} {result['ops_per_sec']:>12,.1f} ops/s  "
+                f"p50 {result['latency_us']['p50']:>11,.1f} us  "
+                f"p99 {result['latency_us']['p99']:>11,.1f} us",
+                flush=True,
+            )
+
+    return {
+        "metadata": {
+            "version": VERSION,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "quick": quick,
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--output", "-o", help="Path to save the results to as JSON.")
+    parser.add_argument("--quick", action="store_true", help="Run fewer, smaller benchmarks.")
+    parser.add_argument("--filter", help="Only run benchmarks whose names contain this.")
+    parser.add_argument(
+        "--min-time", type=float, help="Minimum number of seconds to run each benchmark for."
+    )
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick, name_filter=args.filter, min_time=args.min_time)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from .decode import DecodeError, decode
 from .encode import encode
-from .merge import merge, merge_from_dotlist
+from .merge import compile_overrides, merge, merge_from_dotlist
 from .registrable import Registrable
 from .types import Dataclass
 
@@ -12,4 +12,14 @@ __all__ = [
     "decode",
     "merge",
     "merge_from_dotlist",
+    "compile_overrides",
 ]
+
+
+def __getattr__(name: str):
+    # Optional submodules are only imported when they're first accessed.
+    if name == "ndarray":
+        import importlib
+
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,25 +1,77 @@
 from __future__ import annotations
 
+import abc
 import dataclasses
-import pathlib
+import io
+import json
+import sys
 import warnings
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, ClassVar, Generator, Literal, Type, TypeVar
+from typing import IO, Any, Callable, ClassVar, Literal, Sequence, Type, TypeVar
 
+from .instrument import _count_custom_handler_hit, _current_stats, _listeners, _observe
 from .registrable import Registrable
 from .types import *
+from .types import _HandlerDict
 
 C = TypeVar("C", bound=Dataclass)
 
+_PRIMITIVE_TYPES: frozenset[type] = frozenset((str, int, float, bool, type(None)))
+
 
 class Encoder:
-    custom_handlers: ClassVar[dict[Type, Callable[[Any], Any]]] = {}
+    custom_handlers: ClassVar[dict[Type, Callable[[Any], Any]]] = _HandlerDict(
+        on_change=lambda: Encoder._on_handlers_change()
+    )
+
+    # Maps the exact type of a value to the custom handler to fall back to, if any.
+    _dispatch_cache: ClassVar[dict[Type, Callable[[Any], Any] | None]] = {}
+
+    # The 'abc.get_cache_token()' that '_dispatch_cache' is valid for, like in
+    # 'functools.singledispatch()', or None if there are no custom handlers for ABCs.
+    _dispatch_cache_token: ClassVar[object | None] = None
+
+    # The primitive types without a custom handler, which containers can be copied in bulk
+    # when all of their items are instances of.
+    _bulk_types: ClassVar[frozenset[type]] = _PRIMITIVE_TYPES
+
+    # Encode plans are cached per set of options, then per class.
+    _plans: ClassVar[dict[tuple[bool, bool, str], dict[Type, _EncodePlan]]] = {}
+
+    def __init__(self):
+        self._encoders: dict[tuple[bool, bool, str, bool], Callable[..., Any]] = {}
+        self._json_writers: dict[tuple[bool, bool, str], Callable[..., None]] = {}
 
     def register_encoder(self, encoder_fun: Callable[[Any], Any], *target_types: Type):
         for type in target_types:
             self.custom_handlers[type] = encoder_fun
 
+    @classmethod
+    def clear_cache(cls):
+        """
+        Clear the cache of encode plans and custom handler lookups.
+        """
+        for plans in cls._plans.values():
+            plans.clear()
+        cls._dispatch_cache.clear()
+
+    @classmethod
+    def _on_handlers_change(cls):
+        cls._dispatch_cache.clear()
+        cls._bulk_types = _PRIMITIVE_TYPES - cls.custom_handlers.keys()
+        cls._dispatch_cache_token = None
+        if any(isinstance(t, abc.ABCMeta) for t in cls.custom_handlers):
+            cls._dispatch_cache_token = abc.get_cache_token()
+
+    @classmethod
+    def _check_dispatch_cache_token(cls):
+        # Registering a virtual subclass with an ABC changes which handlers apply to it.
+        token = abc.get_cache_token()
+        if token != cls._dispatch_cache_token:
+            cls._dispatch_cache.clear()
+            cls._dispatch_cache_token = token
+
     def __call__(
         self,
         data: Any,
@@ -29,6 +81,7 @@ class Encoder:
         recurse: bool = True,
         errors: Literal["raise", "ignore", "stringify"] = "raise",
         strict: bool | None = None,
+        reuse_containers: bool = False,
     ) -> Any:
         """
         Encode a Python object into JSON-safe dictionary. The inverse of :func:`decode()`.
@@ -42,6 +95,9 @@ class Encoder:
             If ``"stringify"`` the value is converted to a string.
         :param strict: Deprecated. Use ``errors`` instead.
             ``True`` is equivalent to ``errors="raise"`` and ``False`` is equivalent to ``errors="stringify"``.
+        :param reuse_containers: Return lists and dictionaries that only contain strings, numbers,
+            booleans, and ``None`` as-is instead of copying them. The output then shares those
+            containers with the input, so mutating one will mutate the other.
         """
 
         if strict is not None:
@@ -52,52 +108,346 @@ class Encoder:
             )
             errors = "raise" if strict else "stringify"
 
-        def iter_fields(d) -> Generator[tuple[str, Any], None, None]:
-            for field in dataclasses.fields(d):
-                value = getattr(d, field.name)
-                if not field.init:
-                    continue
-                elif exclude_none and value is None:
-                    continue
-                elif exclude_private_fields and field.name.startswith("_"):
-                    continue
-                else:
-                    yield (field.name, value)
+        if _listeners and _current_stats.get() is None:
+            return _observe(
+                "encode",
+                type(data),
+                lambda: self(
+                    data,
+                    exclude_none=exclude_none,
+                    exclude_private_fields=exclude_private_fields,
+                    recurse=recurse,
+                    errors=errors,
+                    reuse_containers=reuse_containers,
+                ),
+                lambda result: result,
+            )
+
+        as_dict = self._encoders.get(
+            (exclude_none, exclude_private_fields, errors, reuse_containers)
+        )
+        if as_dict is None:
+            as_dict = self._get_encoder(
+                exclude_none, exclude_private_fields, errors, reuse_containers
+            )
+        return as_dict(data, recurse)
+
+    def encode_json(
+        self,
+        data: Any,
+        *,
+        exclude_none: bool = False,
+        exclude_private_fields: bool = False,
+        errors: Literal["raise", "ignore", "stringify"] = "raise",
+    ) -> str:
+        """
+        Encode a Python object directly to a JSON string. This is equivalent to
+        ``json.dumps(encode(data, ...))`` but it writes the JSON while walking the object
+        instead of building an intermediate dictionary first.
+
+        See :meth:`__call__()` for a description of the options.
+        """
+        if _listeners and _current_stats.get() is None:
+            return _observe(
+                "encode_json",
+                type(data),
+                lambda: self.encode_json(
+                    data,
+                    exclude_none=exclude_none,
+                    exclude_private_fields=exclude_private_fields,
+                    errors=errors,
+                ),
+                None,
+            )
+
+        parts: list[str] = []
+        chunks: list[str] = []
+
+        def flush():
+            # Joining pending parts as we go keeps memory usage close to the size of the output.
+            chunks.append("".join(parts))
+            parts.clear()
+
+        write = self._json_writers.get((exclude_none, exclude_private_fields, errors))
+        if write is None:
+            write = self._get_json_writer(exclude_none, exclude_private_fields, errors)
+        write(data, parts, flush)
+        flush()
+        return "".join(chunks)
+
+    def encode_to(
+        self,
+        data: Any,
+        fp: IO[str] | IO[bytes],
+        *,
+        exclude_none: bool = False,
+        exclude_private_fields: bool = False,
+        errors: Literal["raise", "ignore", "stringify"] = "raise",
+    ) -> None:
+        """
+        Like :meth:`encode_json()` but writes the JSON to a file-like object opened in text or
+        binary mode, in chunks, so the full output is never held in memory at once.
+        """
+        if _listeners and _current_stats.get() is None:
+            return _observe(
+                "encode_to",
+                type(data),
+                lambda: self.encode_to(
+                    data,
+                    fp,
+                    exclude_none=exclude_none,
+                    exclude_private_fields=exclude_private_fields,
+                    errors=errors,
+                ),
+                None,
+            )
+
+        parts: list[str] = []
+        binary = _is_binary(fp)
+
+        def flush():
+            chunk = "".join(parts)
+            parts.clear()
+            fp.write(chunk.encode() if binary else chunk)  # type: ignore[arg-type]
+
+        write = self._json_writers.get((exclude_none, exclude_private_fields, errors))
+        if write is None:
+            write = self._get_json_writer(exclude_none, exclude_private_fields, errors)
+        write(data, parts, flush)
+        flush()
+
+    def encode_columnar(
+        self,
+        items: Sequence[Any],
+        *,
+        exclude_private_fields: bool = False,
+        errors: Literal["raise", "ignore", "stringify"] = "raise",
+    ) -> dict[str, list[Any]]:
+        """
+        Encode a list of instances of the same dataclass into columns, i.e. a dictionary mapping
+        each field name to the list of encoded values for that field, plus a ``type`` column for
+        registrable classes. This is much more compact than a list of dictionaries since each
+        key is only stored once. The inverse of :meth:`Decoder.decode_columnar()`.
+
+        See :meth:`__call__()` for a description of the options.
+
+        :raises TypeError: If the items aren't all instances of the same dataclass.
+        """
+        if not items:
+            return {}
+
+        cls = type(items[0])
+        if _listeners and _current_stats.get() is None:
+            return _observe(
+                "encode_columnar",
+                cls,
+                lambda: self.encode_columnar(
+                    items, exclude_private_fields=exclude_private_fields, errors=errors
+                ),
+                lambda columns: columns,
+                rows=len(items),
+            )
+
+        if not dataclasses.is_dataclass(cls) or any(type(item) is not cls for item in items):
+            raise TypeError("encode_columnar() requires instances of the same dataclass")
+
+        options = (False, exclude_private_fields, errors)
+        as_dict = self._encoders.get((*options, False)) or self._get_encoder(*options)
+        plans = self._plans[options]
+        plan = plans.get(cls) or self._get_plan_getter(plans, exclude_private_fields)(items[0])
+
+        columns: dict[str, list[Any]] = {}
+        for name in plan.field_names:
+            values = [getattr(item, name) for item in items]
+            if not self._bulk_types.issuperset(map(type, values)):
+                values = [as_dict(value) for value in values]
+            columns[name] = values
+        if plan.is_registrable:
+            registered_name = plan.get_registered_name()
+            if registered_name is not None:
+                columns["type"] = [registered_name] * len(items)
+        return columns
+
+    def _get_encoder(
+        self,
+        exclude_none: bool,
+        exclude_private_fields: bool,
+        errors: str,
+        reuse_containers: bool = False,
+    ) -> Callable[..., Any]:
+        options = (exclude_none, exclude_private_fields, errors)
+        custom_handlers = self.custom_handlers
+        plans = self._plans.setdefault(options, {})
+        get_plan = self._get_plan_getter(plans, exclude_private_fields)
+        encode_other = self._get_fallback(errors)
 
         def as_dict(d: Any, recurse: bool = True) -> Any:
-            if type(d) in self.custom_handlers:
-                return self.custom_handlers[type(d)](d)
-            elif dataclasses.is_dataclass(d):
-                if recurse:
-                    out = {k: as_dict(v) for k, v in iter_fields(d)}
-                else:
-                    out = {k: v for k, v in iter_fields(d)}
-                if isinstance(d, Registrable):
-                    try:
-                        registered_name = d.get_registered_name()
+            cls = type(d)
+            if cls in custom_handlers:
+                if _listeners:
+                    _count_custom_handler_hit()
+                return custom_handlers[cls](d)
+            elif cls in _PRIMITIVE_TYPES:
+                return d
+
+            plan = plans.get(cls)
+            if plan is None and dataclasses.is_dataclass(d):
+                plan = get_plan(d)
+            if plan is not None:
+                out = {}
+                for name in plan.field_names:
+                    value = getattr(d, name)
+                    if exclude_none and value is None:
+                        continue
+                    out[name] = as_dict(value) if recurse else value
+                if plan.is_registrable:
+                    registered_name = plan.get_registered_name()
+                    if registered_name is not None:
                         out["type"] = registered_name
-                    except ValueError:
-                        pass
                 return out
             elif isinstance(d, dict):
+                # Containers of primitives are copied in bulk, which is much faster than
+                # encoding each item once there are more than a few of them.
+                if len(d) >= _BULK_COPY_MIN_SIZE and Encoder._bulk_types.issuperset(
+                    map(type, d.values())
+                ):
+                    return d if reuse_containers and cls is dict else dict(d)
                 return {k: as_dict(v) for k, v in d.items()}
             elif isinstance(d, (list, tuple, set)):
+                if len(d) >= _BULK_COPY_MIN_SIZE and Encoder._bulk_types.issuperset(map(type, d)):
+                    return d if reuse_containers and cls is list else list(d)
                 return [as_dict(x) for x in d]
             elif isinstance(d, datetime):
                 return d.timestamp()
-            elif isinstance(d, pathlib.Path):
+            elif _is_path(d):
                 return str(d)
             elif isinstance(d, Enum):
                 return d.value
             elif d is None or isinstance(d, (float, int, bool, str)):
                 return d
+            else:
+                return encode_other(d)
+
+        self._encoders[(*options, reuse_containers)] = as_dict
+        return as_dict
+
+    def _get_json_writer(
+        self, exclude_none: bool, exclude_private_fields: bool, errors: str
+    ) -> Callable[[Any, list[str], Callable[[], None] | None], None]:
+        options = (exclude_none, exclude_private_fields, errors)
+        custom_handlers = self.custom_handlers
+        plans = self._plans.setdefault(options, {})
+        get_plan = self._get_plan_getter(plans, exclude_private_fields)
+        encode_other = self._get_fallback(errors)
+        dumps = json.dumps
+
+        # Follows the same rules as 'as_dict()' in '_get_encoder()', writing whatever it
+        # would return as JSON instead.
+        def write(d: Any, parts: list[str], flush: Callable[[], None] | None) -> None:
+            cls = type(d)
+            if cls in custom_handlers:
+                if _listeners:
+                    _count_custom_handler_hit()
+                parts.append(dumps(custom_handlers[cls](d)))
+                return
+            write_scalar = _SCALAR_WRITERS.get(cls)
+            if write_scalar is not None:
+                parts.append(write_scalar(d))
+                return
+
+            plan = plans.get(cls)
+            if plan is None and dataclasses.is_dataclass(d):
+                plan = get_plan(d)
+            if plan is not None:
+                sep = "{"
+                for name, json_key in zip(plan.field_names, plan.json_keys):
+                    value = getattr(d, name)
+                    if exclude_none and value is None:
+                        continue
+                    parts.append(sep)
+                    parts.append(json_key)
+                    write(value, parts, flush)
+                    sep = ", "
+                if plan.is_registrable:
+                    registered_name = plan.get_registered_name()
+                    if registered_name is not None:
+                        parts.append(sep)
+                        parts.append('"type": ')
+                        parts.append(_encode_str(registered_name))
+                        sep = ", "
+                parts.append("{}" if sep == "{" else "}")
+            elif isinstance(d, dict):
+                if len(d) >= _BULK_COPY_MIN_SIZE and Encoder._bulk_types.issuperset(
+                    map(type, d.values())
+                ):
+                    parts.append(dumps(d))
+                    return
+                sep = "{"
+                for k, v in d.items():
+                    parts.append(sep)
+                    parts.append(_json_key(k))
+                    parts.append(": ")
+                    write(v, parts, flush)
+                    sep = ", "
+                parts.append("{}" if sep == "{" else "}")
+            elif isinstance(d, (list, tuple, set)):
+                if len(d) >= _BULK_COPY_MIN_SIZE and Encoder._bulk_types.issuperset(map(type, d)):
+                    parts.append(dumps(d if cls is list or cls is tuple else list(d)))
+                    return
+                sep = "["
+                for x in d:
+                    parts.append(sep)
+                    write(x, parts, flush)
+                    sep = ", "
+                parts.append("[]" if sep == "[" else "]")
+            elif isinstance(d, datetime):
+                parts.append(_float_str(d.timestamp()))
+            elif _is_path(d):
+                parts.append(_encode_str(str(d)))
+            elif isinstance(d, Enum):
+                parts.append(dumps(d.value))
+            elif d is None or isinstance(d, (float, int, bool, str)):
+                parts.append(dumps(d))
+            else:
+                parts.append(dumps(encode_other(d)))
+
+            if flush is not None and len(parts) >= _FLUSH_PARTS:
+                flush()
+
+        self._json_writers[options] = write
+        return write
 
-            for t, h in self.custom_handlers.items():
-                try:
-                    if isinstance(d, t):
-                        return h(d)
-                except TypeError:
-                    continue
+    def _get_plan_getter(
+        self, plans: dict[Type, _EncodePlan], exclude_private_fields: bool
+    ) -> Callable[[Any], _EncodePlan]:
+        def get_plan(d: Any) -> _EncodePlan:
+            if isinstance(d, type):
+                # A dataclass type rather than an instance, which is rare enough not to cache.
+                return _EncodePlan(d, exclude_private_fields, is_registrable=False)
+            plan = plans.get(type(d))
+            if plan is None:
+                plan = _EncodePlan(type(d), exclude_private_fields)
+                plans[type(d)] = plan
+            return plan
+
+        return get_plan
+
+    def _get_fallback(self, errors: str) -> Callable[[Any], Any]:
+        custom_handlers = self.custom_handlers
+        dispatch_cache = self._dispatch_cache
+
+        def encode_other(d: Any) -> Any:
+            if Encoder._dispatch_cache_token is not None:
+                Encoder._check_dispatch_cache_token()
+            cls = type(d)
+            try:
+                handler = dispatch_cache[cls]
+            except KeyError:
+                handler = dispatch_cache[cls] = _resolve_handler(d, custom_handlers)
+            if handler is not None:
+                if _listeners:
+                    _count_custom_handler_hit()
+                return handler(d)
 
             if errors == "raise":
                 raise TypeError(f"not sure how to encode '{d}' of type {type(d).__name__}")
@@ -108,7 +458,123 @@ class Encoder:
             else:
                 raise ValueError(f"Invalid value for 'errors': {errors!r}")
 
-        return as_dict(data, recurse=recurse)
+        return encode_other
+
+
+def _resolve_handler(
+    d: Any, custom_handlers: dict[Type, Callable[[Any], Any]]
+) -> Callable[[Any], Any] | None:
+    """
+    Find the custom handler for a value whose exact type isn't registered, preferring the
+    handler for the closest class in its MRO, like :func:`functools.singledispatch`, then
+    the first handler whose type matches with ``isinstance()`` (e.g. for ABCs and protocols).
+    """
+    for t in type(d).__mro__:
+        if t in custom_handlers:
+            return custom_handlers[t]
+    for t, h in custom_handlers.items():
+        try:
+            if isinstance(d, t):
+                return h
+        except TypeError:
+            continue
+    return None
+
+
+# The minimum size of a container of primitives to check for and copy in bulk.
+_BULK_COPY_MIN_SIZE = 8
+
+# The number of pending chunks 'Encoder.encode_to()' collects before writing them out.
+_FLUSH_PARTS = 1 << 12
+
+_encode_str: Callable[[str], str] = json.encoder.encode_basestring_ascii  # type: ignore[attr-defined]
+_INFINITY = float("inf")
+
+
+def _float_str(f: float) -> str:
+    # Same as the 'json' module.
+    if f != f:
+        return "NaN"
+    elif f == _INFINITY:
+        return "Infinity"
+    elif f == -_INFINITY:
+        return "-Infinity"
+    else:
+        return float.__repr__(f)
+
+
+_SCALAR_WRITERS: dict[Type, Callable[[Any], str]] = {
+    str: _encode_str,
+    int: int.__repr__,
+    float: _float_str,
+    bool: lambda b: "true" if b else "false",
+    type(None): lambda _: "null",
+}
+
+
+def _is_path(d: Any) -> bool:
+    # 'pathlib' is slow to import, and there can't be any paths to encode unless it's already
+    # been imported.
+    pathlib = sys.modules.get("pathlib")
+    return pathlib is not None and isinstance(d, pathlib.Path)
+
+
+def _json_key(k: Any) -> str:
+    # Same key conversions as the 'json' module.
+    if isinstance(k, str):
+        return _encode_str(k)
+    elif isinstance(k, float):
+        return _encode_str(_float_str(k))
+    elif k is True:
+        return '"true"'
+    elif k is False:
+        return '"false"'
+    elif k is None:
+        return '"null"'
+    elif isinstance(k, int):
+        return _encode_str(int.__repr__(k))
+    else:
+        raise TypeError(f"keys must be str, int, float, bool or None, not {type(k).__name__}")
+
+
+def _is_binary(fp: Any) -> bool:
+    if isinstance(fp, io.TextIOBase):
+        return False
+    elif isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+    else:
+        return "b" in getattr(fp, "mode", "")
+
+
+class _EncodePlan:
+    """
+    The parts of encoding a dataclass that only depend on its class and the encoding options.
+    """
+
+    __slots__ = ("cls", "field_names", "is_registrable", "json_keys")
+
+    def __init__(self, cls: Type, exclude_private_fields: bool, is_registrable: bool | None = None):
+        self.cls = cls
+        self.field_names = tuple(
+            field.name
+            for field in dataclasses.fields(cls)
+            if field.init and not (exclude_private_fields and field.name.startswith("_"))
+        )
+        self.json_keys = tuple(f"{_encode_str(name)}: " for name in self.field_names)
+        if is_registrable is None:
+            is_registrable = issubclass(cls, Registrable)
+        self.is_registrable = is_registrable
+
+    def get_registered_name(self) -> str | None:
+        # Not cached since the class could be registered, or registered under another name,
+        # after the plan is made.
+        registered_name = self.cls.__dict__.get("registered_name")
+        if registered_name is None:
+            try:
+                registered_name = self.cls.get_registered_name()
+            except ValueError:
+                pass
+        return registered_name
 
 
 encode = Encoder()
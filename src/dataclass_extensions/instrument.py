@@ -0,0 +1,263 @@
+"""
+Optional instrumentation for :func:`encode()` and :func:`decode()`.
+
+Listeners added with :func:`add_listener()` are called with an :class:`Event` after every
+top-level call to the methods of :class:`Encoder` and :class:`Decoder`, i.e. :func:`encode()`
+and :func:`decode()`, the JSON methods, and the batch methods. Batch methods like
+:meth:`Decoder.decode_many()` produce one event per batch, except for
+:meth:`Decoder.decode_iter()`, which produces one event per record. Calls made from inside
+another call, e.g. from a custom handler, are counted as part of the outer call. When there
+are no listeners the only cost is checking for them once per call.
+
+:class:`Metrics` is a listener that aggregates events into counters and latency histograms
+per operation and class::
+
+    from dataclass_extensions.instrument import Metrics, add_listener
+
+    metrics = Metrics()
+    add_listener(metrics)
+    ...
+    for (operation, cls_name), stats in metrics.snapshot().items():
+        print(operation, cls_name, stats["calls"], stats["duration_us"]["total"])
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+__all__ = ["CallStats", "Event", "Metrics", "add_listener", "remove_listener"]
+
+T = TypeVar("T")
+
+
+@dataclass
+class CallStats:
+    """
+    Counters collected during a single top-level call.
+    """
+
+    rows: int = 1
+    """The number of instances encoded or decoded, which is the batch size for batch methods."""
+
+    nodes: int = 0
+    """
+    The number of values in the data, i.e. the input to a decode method or the output of an
+    encode method, counting every dictionary, list, and scalar. Not counted if the call fails,
+    or for :meth:`Encoder.encode_json()` and :meth:`Encoder.encode_to()`, which write JSON
+    without building the data.
+    """
+
+    union_fallbacks: int = 0
+    """The number of values of a union type that didn't match the first member tried."""
+
+    failed_branches: int = 0
+    """The number of union members that were tried and didn't match."""
+
+    custom_handler_hits: int = 0
+    """The number of values that went through a custom encoder or decoder."""
+
+
+@dataclass
+class Event:
+    """
+    Describes a top-level call to a method of :class:`Encoder` or :class:`Decoder`.
+    """
+
+    operation: str
+    """
+    The name of the method, e.g. ``"encode"`` or ``"decode_many"``. Calling an encoder or
+    decoder directly is ``"encode"`` or ``"decode"``.
+    """
+
+    cls: type
+    """
+    The class that was decoded, or the type of the value that was encoded. For
+    :meth:`Encoder.encode_columnar()` this is the class of the items.
+    """
+
+    duration: float
+    """How long the call took, in seconds."""
+
+    stats: CallStats
+    error: BaseException | None = None
+    """The exception raised by the call, if any."""
+
+
+Listener = Callable[[Event], Any]
+
+_listeners: list[Listener] = []
+_current_stats: ContextVar[CallStats | None] = ContextVar("_current_stats", default=None)
+
+
+def add_listener(listener: Listener):
+    """
+    Add a function to call with an :class:`Event` after every top-level encode or decode call.
+    Listeners are called synchronously in the thread that made the call, so they should be fast.
+    """
+    if not _listeners:
+        _on_enabled_change()
+    _listeners.append(listener)
+
+
+def remove_listener(listener: Listener):
+    """
+    Remove a listener added with :func:`add_listener()`.
+
+    :raises ValueError: If the listener was never added.
+    """
+    _listeners.remove(listener)
+    if not _listeners:
+        _on_enabled_change()
+
+
+def _on_enabled_change():
+    from .decode import Decoder
+
+    # Decode plans only count custom handler hits when they're compiled while there
+    # are listeners, so they need to be recompiled.
+    Decoder.clear_cache()
+
+
+def _observe(
+    operation: str,
+    cls: type,
+    call: Callable[[], T],
+    get_data: Callable[[T], Any] | None,
+    rows: int = 1,
+) -> T:
+    """
+    Call ``call`` and notify the listeners. ``get_data`` is called with the result to get
+    the data to count the nodes of.
+    """
+    stats = CallStats(rows=rows)
+    token = _current_stats.set(stats)
+    error: BaseException | None = None
+    start = time.perf_counter()
+    try:
+        result = call()
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current_stats.reset(token)
+        if error is None and get_data is not None:
+            stats.nodes = _count_nodes(get_data(result))
+        event = Event(operation, cls, duration, stats, error)
+        for listener in list(_listeners):
+            listener(event)
+    return result
+
+
+def _count_nodes(data: Any) -> int:
+    nodes = 0
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        nodes += 1
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return nodes
+
+
+def _count_custom_handler_hit():
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.custom_handler_hits += 1
+
+
+def _count_failed_branch(first: bool):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.failed_branches += 1
+        if first:
+            stats.union_fallbacks += 1
+
+
+def _counting_handler(handler: Callable[[Any], T]) -> Callable[[Any], T]:
+    def count_and_call(value: Any) -> T:
+        _count_custom_handler_hit()
+        return handler(value)
+
+    return count_and_call
+
+
+class Metrics:
+    """
+    A listener that aggregates events into counters and a histogram of durations for each
+    operation and class. It's safe to use from multiple threads.
+
+    :param buckets: The upper bounds of the histogram buckets, in microseconds. Durations
+        longer than the last bound are counted in an extra overflow bucket.
+    """
+
+    DEFAULT_BUCKETS: tuple[float, ...] = tuple(2.0**i for i in range(1, 25))
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._metrics: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def __call__(self, event: Event):
+        duration_us = event.duration * 1e6
+        bucket = bisect.bisect_left(self.buckets, duration_us)
+        key = (event.operation, f"{event.cls.__module__}.{event.cls.__qualname__}")
+        with self._lock:
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                metrics = self._metrics[key] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "rows": 0,
+                    "nodes": 0,
+                    "union_fallbacks": 0,
+                    "failed_branches": 0,
+                    "custom_handler_hits": 0,
+                    "duration_us": {
+                        "total": 0.0,
+                        "max": 0.0,
+                        "histogram": [0] * (len(self.buckets) + 1),
+                    },
+                }
+            metrics["calls"] += 1
+            metrics["errors"] += event.error is not None
+            metrics["rows"] += event.stats.rows
+            metrics["nodes"] += event.stats.nodes
+            metrics["union_fallbacks"] += event.stats.union_fallbacks
+            metrics["failed_branches"] += event.stats.failed_branches
+            metrics["custom_handler_hits"] += event.stats.custom_handler_hits
+            durations = metrics["duration_us"]
+            durations["total"] += duration_us
+            durations["max"] = max(durations["max"], duration_us)
+            durations["histogram"][bucket] += 1
+
+    def snapshot(self) -> dict[tuple[str, str], dict[str, Any]]:
+        """
+        Get a copy of the metrics, keyed by the operation and the fully qualified name of
+        the class. The histogram counts line up with :data:`buckets`, plus an overflow bucket.
+        """
+        with self._lock:
+            return {
+                key: {
+                    **metrics,
+                    "duration_us": {
+                        **metrics["duration_us"],
+                        "histogram": list(metrics["duration_us"]["histogram"]),
+                    },
+                }
+                for key, metrics in self._metrics.items()
+            }
+
+    def reset(self):
+        """
+        Clear all of the metrics.
+        """
+        with self._lock:
+            self._metrics.clear()
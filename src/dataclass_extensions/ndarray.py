@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Any
+
+from .decode import Decoder, decode
+from .encode import Encoder, encode
+
+
+def register_ndarray_handlers(encoder: Encoder = encode, decoder: Decoder = decode):
+    """
+    Opt in to support for fields annotated as ``numpy.ndarray``. Arrays are encoded as
+    (nested) lists and decoded from (nested) lists of numbers in a single vectorized
+    conversion with :func:`numpy.asarray()`. NumPy scalars are encoded as Python scalars.
+
+    :raises ImportError: If NumPy isn't installed.
+    """
+    import numpy as np
+
+    def decode_ndarray(value: Any) -> Any:
+        if isinstance(value, np.ndarray):
+            return value
+        array = np.asarray(value)
+        if array.dtype.kind not in "biuf":
+            raise TypeError(f"expected a (nested) list of numbers, got an array of {array.dtype}")
+        return array
+
+    decoder.register_decoder(decode_ndarray, np.ndarray)
+    encoder.register_encoder(lambda array: array.tolist(), np.ndarray)
+    # These are also subclasses of Python scalars, which the encoder would otherwise
+    # return as-is before it falls back to the handler for 'np.generic'.
+    encoder.register_encoder(lambda scalar: scalar.item(), np.generic, np.float64, np.str_)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import dataclasses
+import importlib
 import sys
 import typing
 from dataclasses import dataclass
@@ -16,6 +17,8 @@ if sys.version_info < (3, 11):
 @dataclass
 class Registrable:
     _registry: ClassVar[dict[str, Type[Registrable]]]
+    _registered_names: ClassVar[dict[Type[Registrable], str]]
+    _lazy_registry: ClassVar[dict[str, str]]
     _default_type: ClassVar[str | None]
     registered_name: ClassVar[str | None]
     registered_base: ClassVar[Type[Registrable] | None]
@@ -27,20 +30,22 @@ class Registrable:
     def __new__(cls, *args, type: str | None = None, **kwargs):
         del args, kwargs
         if type is not None and type != cls.registered_name:
-            if type not in cls._registry:
+            if type not in cls._registry and not cls._import_lazy(type):
                 raise KeyError(
                     f"'{type}' is not registered name for {cls.__name__}. "
                     f"Available choices are: {list(cls._registry.keys())}"
                 )
             return super().__new__(cls._registry[type])
         elif cls._default_type is not None and cls.registered_name is None:
-            return super().__new__(cls._registry[cls._default_type])
+            return super().__new__(cls.get_registered_class(cls._default_type))
         else:
             return super().__new__(cls)
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         cls._registry = {}
+        cls._registered_names = {}
+        cls._lazy_registry = {}
         cls._default_type = None
         if not hasattr(cls, "registered_name"):
             cls.registered_name = None
@@ -71,18 +76,111 @@ class Registrable:
                 else:
                     cls._default_type = name
 
+            replaced = cls._registry.get(name)
             cls._registry[name] = subclass
+            cls._lazy_registry.pop(name, None)
+            if replaced is not None and cls._registered_names.get(replaced) == name:
+                # Fall back to the last other name the replaced class is registered under, if any.
+                del cls._registered_names[replaced]
+                for alias, registered_subclass in reversed(cls._registry.items()):
+                    if registered_subclass is replaced:
+                        cls._registered_names[replaced] = alias
+                        if replaced.registered_base is cls:
+                            replaced.registered_name = alias
+                        break
+
+            # When a class is registered under several names, the last one is its
+            # 'registered_name', which is what 'encode()' writes, and the others are aliases.
+            cls._registered_names[subclass] = name
             subclass.registered_name = name
             subclass.registered_base = cls
+            # Nothing is registered with the subclass yet, so it can skip the dispatch in
+            # '__new__()' until something is.
+            cls._use_dispatching_new()
+            if _has_registrable_new(subclass):
+                subclass.__new__ = staticmethod(_new_registered)  # type: ignore[assignment]
             return subclass  # type: ignore
 
         return register_subclass
 
+    @classmethod
+    def _use_dispatching_new(cls):
+        if cls.__new__ is _new_registered:
+            cls.__new__ = Registrable.__dict__["__new__"]  # type: ignore[method-assign]
+
+    @classmethod
+    def register_lazy(cls, name: str, target: str, default: bool = False):
+        """
+        Register a subclass by its import path, ``"module:qualname"``, without importing it.
+        The module is imported the first time the name is needed, e.g. to decode or
+        instantiate the subclass, and the subclass is then registered under the name.
+        """
+        if cls is Registrable:
+            raise TypeError("Cannot register with the base Registrable class itself")
+        module_name, _, qualname = target.partition(":")
+        if not module_name or not qualname:
+            raise ValueError(f"Expected a target of the form 'module:qualname', got '{target}'")
+        if default:
+            if cls._default_type is not None:
+                raise ValueError(
+                    f"A default implementation for {cls.__name__} has already been registered"
+                )
+            else:
+                cls._default_type = name
+        cls._lazy_registry[name] = target
+        cls._use_dispatching_new()
+
+    @classmethod
+    def register_entry_points(cls, group: str) -> list[str]:
+        """
+        Lazily register the subclasses advertised by installed packages under an entry point
+        ``group``, with :meth:`register_lazy()`. The entry point names are used as the
+        registered names.
+
+        :returns: The names that were registered.
+        """
+        from importlib.metadata import entry_points
+
+        names = []
+        for entry_point in entry_points(group=group):
+            cls.register_lazy(entry_point.name, entry_point.value)
+            names.append(entry_point.name)
+        return names
+
+    @classmethod
+    def _import_lazy(cls, name: str) -> bool:
+        target = cls._lazy_registry.get(name)
+        if target is None:
+            return False
+        module_name, _, qualname = target.partition(":")
+        subclass = importlib.import_module(module_name)
+        for attr in qualname.split("."):
+            subclass = getattr(subclass, attr)
+        # Importing the module may have already registered the subclass.
+        if cls._registry.get(name) is not subclass:
+            cls.register(name)(subclass)  # type: ignore[arg-type]
+        cls._lazy_registry.pop(name, None)
+        return True
+
+    @classmethod
+    def _import_lazy_subclass(cls, subclass: Type[Registrable]) -> bool:
+        target = f"{subclass.__module__}:{subclass.__qualname__}"
+        for name, lazy_target in list(cls._lazy_registry.items()):
+            if lazy_target == target:
+                return cls._import_lazy(name)
+        return False
+
     @classmethod
     def get_registered_name(cls: Type[R], subclass: Type[R] | None = None) -> str:
         if cls is Registrable:
             raise TypeError("Cannot register the base Registrable class itself")
         if subclass is None:
+            if cls.__dict__.get("registered_name") is None:
+                # The class might be registered lazily and imported some other way.
+                for base in cls.__mro__[1:]:
+                    if issubclass(base, Registrable) and base is not Registrable:
+                        if base._import_lazy_subclass(cls):
+                            break
             if cls.registered_name is not None:
                 return cls.registered_name
             else:
@@ -90,19 +188,20 @@ class Registrable:
                     f"class {cls.__name__} is not a registered subclass of any base registrable class"
                 )
 
-        for name, registered_subclass in cls._registry.items():
-            if registered_subclass == subclass:
-                return name
-
-        raise ValueError(
-            f"class {subclass.__name__} is not a registered subclass of {cls.__name__}"
-        )
+        name = cls._registered_names.get(subclass)
+        if name is None and cls._import_lazy_subclass(subclass):
+            name = cls._registered_names.get(subclass)
+        if name is None:
+            raise ValueError(
+                f"class {subclass.__name__} is not a registered subclass of {cls.__name__}"
+            )
+        return name
 
     @classmethod
     def get_registered_class(cls: Type[R], type: str) -> Type[R]:
         if cls is Registrable:
             raise TypeError("Cannot register with the base Registrable class itself")
-        if type not in cls._registry:
+        if type not in cls._registry and not cls._import_lazy(type):
             raise KeyError(
                 f"'{type}' is not registered name for {cls.__name__}. "
                 f"Available choices are: {cls.get_registered_names()}"
@@ -113,7 +212,9 @@ class Registrable:
     def get_registered_names(cls) -> list[str]:
         if cls is Registrable:
             raise TypeError("Cannot register with the base Registrable class itself")
-        return list(cls._registry.keys())
+        return list(cls._registry.keys()) + [
+            name for name in cls._lazy_registry if name not in cls._registry
+        ]
 
     @classmethod
     def get_default(cls: Type[R]) -> Type[R]:
@@ -122,3 +223,26 @@ class Registrable:
         if cls._default_type is None:
             raise ValueError(f"A default implementation of {cls.__name__} has not been registered")
         return cls.get_registered_class(cls._default_type)
+
+
+_object_new = object.__new__
+
+
+def _new_registered(cls, *args, **kwargs):
+    # Fast path for registered subclasses that nothing is registered with.
+    if "type" in kwargs and kwargs["type"] != cls.registered_name:
+        return Registrable.__new__(cls, *args, **kwargs)
+    return _object_new(cls)
+
+
+def _has_registrable_new(cls: type) -> bool:
+    # Whether 'Registrable.__new__()' is the only '__new__()' that instances of the class would
+    # go through, in which case it's safe to replace.
+    for base in cls.__mro__[:-1]:
+        new = base.__dict__.get("__new__")
+        if new is not None and getattr(new, "__func__", new) not in (
+            Registrable.__dict__["__new__"].__func__,
+            _new_registered,
+        ):
+            return False
+    return True
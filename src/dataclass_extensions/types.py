@@ -1,5 +1,5 @@
 import os
-from typing import Any, ClassVar, Protocol
+from typing import Any, Callable, ClassVar, Protocol
 
 __all__ = [
     "MISSING",
@@ -13,3 +13,50 @@ PathOrStr = os.PathLike | str
 
 class Dataclass(Protocol):
     __dataclass_fields__: ClassVar[dict[str, Any]]
+
+
+class _HandlerDict(dict):
+    """
+    A ``dict`` of custom handlers that calls ``on_change`` whenever it's modified, so that
+    anything compiled against the handlers can be invalidated.
+    """
+
+    def __init__(self, on_change: Callable[[], Any]):
+        super().__init__()
+        self.on_change = on_change
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.on_change()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.on_change()
+
+    def __ior__(self, other):  # type: ignore[misc]
+        result = super().__ior__(other)
+        self.on_change()
+        return result
+
+    def clear(self):
+        super().clear()
+        self.on_change()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self.on_change()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self.on_change()
+        return result
+
+    def setdefault(self, *args):
+        result = super().setdefault(*args)
+        self.on_change()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.on_change()
@@ -2,8 +2,13 @@ from __future__ import annotations
 
 import collections.abc
 import dataclasses
+import gc
+import io
+import json
+import pickle
 import sys
 import typing
+import weakref
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -11,7 +16,19 @@ from typing import Any
 
 import pytest
 
-from dataclass_extensions.decode import DecodeError, _coerce, decode
+from dataclass_extensions.decode import (
+    DecodeError,
+    DecodeFailure,
+    Decoder,
+    _coerce,
+    _compile_coercer,
+    _get_json_loads,
+    _get_type_hints,
+    _iter_json_values,
+    _resolve_type_hint,
+    decode,
+)
+from dataclass_extensions.encode import encode
 from dataclass_extensions.registrable import Registrable
 from dataclass_extensions.types import *
 
@@ -145,6 +162,25 @@ dt_now = datetime.now()
             int,
             100,
         ),
+        # Numeric sequences.
+        pytest.param(
+            [1.5, 2, True, "1e2"],
+            list[float],
+            [1.5, 2.0, 1.0, 100.0],
+            id="list[float]",
+        ),
+        pytest.param(
+            (1, 2),
+            tuple[float, ...],
+            (1.0, 2.0),
+            id="tuple[float, ...]",
+        ),
+        pytest.param(
+            [1, True, 2.0, "3"],
+            typing.Sequence[int],
+            (1, True, 2, 3),
+            id="typing.Sequence[int]",
+        ),
         # Aliases.
         pytest.param(
             0,
@@ -161,8 +197,12 @@ dt_now = datetime.now()
         ),
     ],
 )
-def test_coerce_from_type_hints(value: Any, type_hint: Any, expected: Any):
-    result = _coerce(value, type_hint, {}, "0", type(value))
+@pytest.mark.parametrize("compiled", [False, True], ids=["generic", "compiled"])
+def test_coerce_from_type_hints(value: Any, type_hint: Any, expected: Any, compiled: bool):
+    if compiled:
+        result = _compile_coercer(type_hint, type(value), decode)(value, "0")
+    else:
+        result = _coerce(value, type_hint, {}, "0", type(value))
     assert type(result) is type(expected)
     assert result == expected
 
@@ -577,6 +617,19 @@ def test_recursive_decode_with_str_forward_reference():
     assert x.children[0].children[0].name == "l3"
 
 
+def test_forward_reference_cache():
+    decode.clear_cache()
+    decode(RecursiveType2, {"name": "l1", "children": None})
+    assert _resolve_type_hint("RecursiveType2", RecursiveType2) is RecursiveType2
+    assert Decoder._plans[RecursiveType2].forward_refs["RecursiveType2"] is RecursiveType2
+
+    decode.clear_cache()
+    assert RecursiveType2 not in Decoder._plans
+    # Without a decode plan the forward reference is resolved but not cached.
+    assert _resolve_type_hint("RecursiveType2", RecursiveType2) is RecursiveType2
+    assert RecursiveType2 not in Decoder._plans
+
+
 def test_nested_recursive_decode_with_str_forward_reference():
     @dataclass
     class Config:
@@ -700,3 +753,542 @@ def test_decode_union_of_list_types():
     c = decode(ConfigWithUnionOfListTypes, {"items": [{"y": 2}]})
     assert isinstance(c, ConfigWithUnionOfListTypes)
     assert isinstance(c.items[0], Config2)
+
+
+def test_decode_plan_is_cached():
+    @dataclass
+    class Config:
+        foo: Foo
+        items: list[Config1 | Config2]
+
+    decode.clear_cache()
+    c1 = decode(Config, {"foo": {"x": 0}, "items": [{"x": 1}, {"y": 2}]})
+    assert Config in Decoder._plans
+    assert Foo in Decoder._plans
+    plan = Decoder._plans[Config]
+
+    c2 = decode(Config, {"foo": {"x": 0}, "items": [{"x": 1}, {"y": 2}]})
+    assert Decoder._plans[Config] is plan
+    assert c1 == c2
+
+
+def test_decode_plan_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(sys.modules[Decoder.__module__], "_MAX_CACHED_PLANS", 8)
+    decode.clear_cache()
+
+    classes = [dataclasses.make_dataclass(f"Dynamic{i}", [("x", int)]) for i in range(20)]
+    for cls in classes:
+        assert decode(cls, {"x": 1}) == cls(x=1)
+        assert len(Decoder._plans) <= 8
+    assert classes[0] not in Decoder._plans
+    assert classes[-1] in Decoder._plans
+
+    # Dropped plans don't keep their classes alive.
+    ref = weakref.ref(classes[0])
+    del classes[0], cls
+    gc.collect()
+    assert ref() is None
+
+
+def test_decode_plan_invalidated_by_custom_handlers():
+    @dataclass
+    class Config:
+        custom: CustomType
+
+    with pytest.raises(DecodeError):
+        decode(Config, {"custom": {"value": "test"}})
+
+    decode.register_decoder(lambda data: CustomType(data["value"]), CustomType)
+    try:
+        assert decode(Config, {"custom": {"value": "test"}}).custom == CustomType("test")
+    finally:
+        del decode.custom_handlers[CustomType]
+
+    assert Config not in Decoder._plans
+    with pytest.raises(DecodeError):
+        decode(Config, {"custom": {"value": "test"}})
+
+
+def test_decode_error_from_registrable_subclass():
+    @dataclass
+    class Config:
+        item: NestedBaseType
+
+    data = {"item": {"type": "nested1", "x": 1, "z": 2}}
+    with pytest.raises(DecodeError) as exc_info:
+        decode(Config, data)
+
+    with pytest.raises(DecodeError) as generic_exc_info:
+        _coerce(data["item"], NestedBaseType, {}, "item", Config)
+
+    assert str(exc_info.value) == str(generic_exc_info.value)
+    assert "NestedSubType1" in str(exc_info.value)
+
+
+codegen_decode = Decoder(codegen=True)
+
+
+@dataclass
+class Layer:
+    name: str
+    width: int
+    dropout: float | None = None
+
+
+@dataclass
+class ModelConfig:
+    layers: list[Layer]
+    head: Layer | None
+    optimizer: NestedBaseType
+    color: Color | None = None
+    lr: float = 1e-3
+
+
+def test_codegen_decode():
+    data = {
+        "layers": [{"name": "l1", "width": 4, "dropout": 0}, {"name": "l2", "width": "8"}],
+        "head": {"name": "head", "width": 1.0},
+        "optimizer": {"type": "nested1", "x": 1},
+        "color": "red",
+        "lr": 1,
+    }
+    config = codegen_decode(ModelConfig, data)
+    assert config == decode(ModelConfig, data)
+    assert config.layers[0].dropout == 0.0
+    assert type(config.layers[0].dropout) is float
+    assert config.layers[1].width == 8
+    assert type(config.head.width) is int  # type: ignore[union-attr]
+    assert isinstance(config.optimizer, NestedSubType1)
+    assert config.color == Color.RED
+    assert type(config.lr) is float
+
+    assert Decoder._codegen_plans[ModelConfig].build_kwargs is not None
+
+
+def test_codegen_decode_registrable():
+    config = codegen_decode(NestedBaseType, {"type": "nested1", "x": 1, "y": 2})
+    assert config == NestedSubType1(x=1, y=2)
+
+
+def test_codegen_decode_errors_match():
+    cases: list[dict[str, Any]] = [
+        {"layers": [], "head": {"name": "head", "width": 1.5}, "optimizer": {"x": 1}},
+        {"layers": [], "head": {"name": "head"}, "optimizer": {"x": 1}},
+        {"layers": [], "head": None, "optimizer": {"x": 1}, "foo": 1},
+    ]
+    for data in cases:
+        with pytest.raises(DecodeError) as exc_info:
+            decode(ModelConfig, data)
+        with pytest.raises(DecodeError) as codegen_exc_info:
+            codegen_decode(ModelConfig, data)
+        assert str(codegen_exc_info.value) == str(exc_info.value)
+
+
+def test_codegen_decode_with_custom_handler():
+    @dataclass
+    class Config:
+        custom: CustomType
+        x: int = 1
+
+    codegen_decode.register_decoder(lambda data: CustomType(data["value"]), CustomType)
+    try:
+        config = codegen_decode(Config, {"x": 2, "custom": {"value": "test"}})
+        assert config == Config(custom=CustomType("test"), x=2)
+    finally:
+        del codegen_decode.custom_handlers[CustomType]
+
+
+@dataclass
+class Config3:
+    z: int
+
+
+@dataclass
+class ConfigWithWideUnion:
+    item: Config1 | Config2 | Config3 | int | str | list[int] | None
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        pytest.param({"z": 3}, Config3(z=3), id="last-dataclass"),
+        pytest.param({"y": "2"}, Config2(y=2), id="middle-dataclass"),
+        pytest.param(1, 1, id="int"),
+        pytest.param(1.0, 1, id="float-to-int"),
+        pytest.param("a", "a", id="str"),
+        pytest.param("1", 1, id="str-to-int"),
+        pytest.param([1, "2"], [1, 2], id="list"),
+        pytest.param(None, None, id="none"),
+    ],
+)
+def test_decode_wide_union(value: Any, expected: Any):
+    c = decode(ConfigWithWideUnion, {"item": value})
+    assert type(c.item) is type(expected)
+    assert c.item == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        pytest.param({"z": "a"}, id="failing-dataclass"),
+        pytest.param({"w": 1}, id="unknown-key"),
+        pytest.param(1.5, id="float"),
+        pytest.param({"a"}, id="set"),
+    ],
+)
+def test_decode_wide_union_errors_match(value: Any):
+    type_hint = _get_type_hints(ConfigWithWideUnion)["item"]
+    with pytest.raises(DecodeError) as exc_info:
+        decode(ConfigWithWideUnion, {"item": value})
+    with pytest.raises(DecodeError) as generic_exc_info:
+        _coerce(value, type_hint, {}, "item", ConfigWithWideUnion)
+    assert str(exc_info.value) == str(generic_exc_info.value)
+
+
+def test_decode_error_failures_are_structured():
+    with pytest.raises(DecodeError) as exc_info:
+        decode(ConfigWithUnionOfSubTypes, {"items": [{"z": 2}]})
+
+    failures = exc_info.value.failures
+    assert len(failures) == 2
+    assert all(isinstance(f, DecodeFailure) for f in failures)
+    assert [f.key for f in failures] == ["items.0", "items.0"]  # type: ignore[union-attr]
+    assert [f.allowed_type for f in failures] == [Config1, Config2]  # type: ignore[union-attr]
+    assert all(isinstance(f.exception, AttributeError) for f in failures)  # type: ignore[union-attr]
+    assert exc_info.value.inner_failures == [str(f) for f in failures]
+
+
+def test_decode_error_message_is_lazy_and_truncated():
+    @dataclass
+    class Config:
+        x: int | None
+
+    value = {"data": list(range(100_000))}
+    with pytest.raises(DecodeError) as exc_info:
+        decode(Config, {"x": value})
+
+    assert exc_info.value._coerce_details is not None
+    message = str(exc_info.value)
+    assert exc_info.value._coerce_details is None
+    assert message.startswith("Failed to coerce value {'data': [0, 1, 2,")
+    assert "... at key 'x'" in message
+    assert len(message) < DecodeError.max_value_length + 200
+    assert exc_info.value.args == (message,)
+
+
+def test_decode_error_args_and_inner_failures():
+    @dataclass
+    class Config:
+        x: int | None
+
+    with pytest.raises(DecodeError) as exc_info:
+        decode(Config, {"x": "a"})
+
+    # 'args' renders the message too.
+    error = exc_info.value
+    assert error.args == (str(error),)
+    assert str(error).startswith("Failed to coerce value a at key 'x'")
+    assert pickle.loads(pickle.dumps(error)).args == error.args
+
+    error.inner_failures = ["custom failure"]
+    assert error.inner_failures == ["custom failure"]
+    assert error.failures == ["custom failure"]
+
+    error = DecodeError("message", inner_failures=["failure"])
+    assert error.args == ("message",)
+    error.inner_failures.append("another failure")
+    assert error.inner_failures == ["failure", "another failure"]
+
+
+@pytest.mark.parametrize("decoder", [decode, codegen_decode], ids=["plans", "codegen"])
+def test_decode_many(decoder: Decoder):
+    rows = [{"name": f"l{i}", "width": i, "dropout": None if i % 2 else "0.5"} for i in range(10)]
+    assert decoder.decode_many(Layer, rows) == [decode(Layer, row) for row in rows]
+    assert decoder.decode_many(Layer, iter(rows)) == [decode(Layer, row) for row in rows]
+    assert decoder.decode_many(Layer, []) == []
+
+
+@pytest.mark.parametrize("decoder", [decode, codegen_decode], ids=["plans", "codegen"])
+def test_decode_many_registrable(decoder: Decoder):
+    rows: list[dict[str, Any]] = [
+        {"type": "type1", "x": 1},
+        {"type": "type1", "x": "2"},
+    ]
+    assert decoder.decode_many(BaseType, rows) == [SubType(x=1), SubType(x=2)]
+
+    rows = [{"type": "nested1", "x": 1, "y": 2}, {"x": 3}]
+    assert decoder.decode_many(NestedBaseType, rows) == [
+        NestedSubType1(x=1, y=2),
+        NestedBaseType(x=3),
+    ]
+
+
+def test_decode_many_error():
+    with pytest.raises(DecodeError, match="has no attribute 'z'"):
+        decode.decode_many(Layer, [{"name": "l0", "width": 0}, {"name": "l1", "width": 1, "z": 0}])
+
+
+LAYER_ROWS = [{"name": f"l{i}", "width": i, "dropout": 0.5 * i} for i in range(20)]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        pytest.param("\n".join(json.dumps(row) for row in LAYER_ROWS) + "\n", id="jsonl"),
+        pytest.param(
+            "\n\n" + "\n\n".join(json.dumps(row) for row in LAYER_ROWS), id="jsonl-blank-lines"
+        ),
+        pytest.param(json.dumps(LAYER_ROWS), id="array"),
+        pytest.param(json.dumps(LAYER_ROWS, indent=2) + "\n", id="array-indented"),
+        pytest.param("\ufeff" + json.dumps(LAYER_ROWS), id="array-bom"),
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_json_values(text: str, chunk_size: int):
+    assert list(_iter_json_values(io.StringIO(text), chunk_size=chunk_size)) == LAYER_ROWS
+    assert list(_iter_json_values(io.BytesIO(text.encode()), chunk_size=chunk_size)) == LAYER_ROWS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5])
+def test_iter_json_values_numbers(chunk_size: int):
+    # Numbers that are split across chunks in the middle of their fraction or exponent.
+    numbers = [-0.0015, 1.5e-10, 12345678901234567890, -1e300]
+    for text in (json.dumps(numbers), "\n".join(map(json.dumps, numbers))):
+        assert list(_iter_json_values(io.StringIO(text), chunk_size=chunk_size)) == numbers
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "[]", " [ ] \n"],
+)
+def test_iter_json_values_empty(text: str):
+    assert list(_iter_json_values(io.StringIO(text), chunk_size=2)) == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '[{"a": 1} {"a": 2}]',
+        '[{"a": 1}, {"a": 2}',
+        '[{"a": 1}] {"a": 2}',
+        '{"a": 1}\n{"a": ',
+        '{"a": 1}\n{"a": tru}',
+    ],
+)
+def test_iter_json_values_invalid(text: str):
+    with pytest.raises(json.JSONDecodeError):
+        list(_iter_json_values(io.StringIO(text), chunk_size=2))
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def test_iter_json_values_invalid_stops_reading():
+    rows = [json.dumps(row) for row in LAYER_ROWS] * 5_000
+    rows[10] = '{"name": "l10", "width": 10 "dropout": 5.0}'
+    fp = CountingReader("\n".join(rows).encode())
+    with pytest.raises(json.JSONDecodeError) as exc_info:
+        list(_iter_json_values(fp, chunk_size=1024))
+    assert fp.bytes_read <= 2048 < len(fp.getvalue())
+
+    # The position is in the whole file, not the buffer.
+    error = exc_info.value
+    assert (error.lineno, error.colno) == (11, 29)
+    assert error.pos == sum(len(row) + 1 for row in rows[:10]) + 28
+    assert str(error).endswith(f"line 11 column 29 (char {error.pos})")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_iter_json_values_invalid_position(chunk_size: int):
+    text = '{"a": 1}\n{"a": 2}\n\n  {"a": }'
+    with pytest.raises(json.JSONDecodeError, match=r"line 4 column 9 \(char 27\)"):
+        list(_iter_json_values(io.StringIO(text), chunk_size=chunk_size))
+
+
+def test_decode_iter(tmp_path):
+    path = tmp_path / "layers.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in LAYER_ROWS))
+
+    expected = [decode(Layer, row) for row in LAYER_ROWS]
+    assert list(decode.decode_iter(Layer, path)) == expected
+    assert list(decode.decode_iter(Layer, str(path))) == expected
+    with path.open() as fp:
+        assert list(decode.decode_iter(Layer, fp)) == expected
+
+    instances = decode.decode_iter(NestedBaseType, io.StringIO('[{"type": "nested1", "x": 1}]'))
+    assert list(instances) == [NestedSubType1(x=1)]
+
+
+def test_decode_iter_error():
+    instances = decode.decode_iter(Layer, io.StringIO('{"name": "l0", "width": 0}\n{"foo": 1}'))
+    assert next(instances) == Layer(name="l0", width=0)
+    with pytest.raises(DecodeError, match="has no attribute 'foo'"):
+        next(instances)
+
+
+@dataclass
+class TrustedConfig:
+    model: ModelConfig
+    created: datetime
+    employees: tuple[Employee, ...]
+    points: dict[str, Point2D]
+    colors: set[Color]
+    pair: tuple[int, Color]
+    optional_layers: list[Layer | None]
+    item: Config1 | Config2 | None = None
+    layer_or_name: Layer | str = "default"
+
+
+TRUSTED_CONFIG = TrustedConfig(
+    model=ModelConfig(
+        layers=[Layer(name="l0", width=8), Layer(name="l1", width=4, dropout=0.1)],
+        head=Layer(name="head", width=2),
+        optimizer=NestedSubType1(x=1, y=2),
+        color=Color.RED,
+    ),
+    created=datetime(2024, 1, 2, 3, 4, 5),
+    employees=(Employee("a", 1), Employee("b", 2)),
+    points={"origin": {"x": 0, "y": 0, "label": "origin"}},
+    colors={Color.BLUE},
+    pair=(1, Color.BLUE),
+    optional_layers=[None, Layer(name="l2", width=1)],
+    item=Config2(y=2),
+    layer_or_name=Layer(name="l3", width=3),
+)
+
+
+@pytest.mark.parametrize("decoder", [decode, codegen_decode], ids=["plans", "codegen"])
+def test_decode_trusted(decoder: Decoder):
+    data = encode(TRUSTED_CONFIG)
+    assert decoder(TrustedConfig, data, trusted=True) == TRUSTED_CONFIG
+    assert decoder(TrustedConfig, data, trusted=True) == decoder(TrustedConfig, data)
+
+    data["layer_or_name"] = "x"
+    assert decoder(TrustedConfig, data, trusted=True).layer_or_name == "x"
+
+    instance = decoder(NestedBaseType, {"type": "nested1", "x": 1}, trusted=True)
+    assert instance == NestedSubType1(x=1)
+
+
+def test_decode_trusted_does_not_validate():
+    layer = decode(Layer, {"name": "l0", "width": "8"}, trusted=True)
+    assert layer.width == "8"
+    with pytest.raises(DecodeError, match="Failed to decode Layer"):
+        decode(Layer, {"name": "l0", "foo": 1}, trusted=True)
+
+
+def test_decode_trusted_with_custom_handler():
+    @dataclass
+    class Config:
+        value: CustomType
+        values: list[CustomType]
+
+    decode.register_decoder(CustomType, CustomType)
+    try:
+        config = decode(Config, {"value": 1, "values": [2, 3]}, trusted=True)
+        assert config == Config(value=CustomType(1), values=[CustomType(2), CustomType(3)])
+    finally:
+        del decode.custom_handlers[CustomType]
+
+
+def test_decode_many_and_iter_trusted():
+    rows = [{"type": "nested1", "x": i} for i in range(3)]
+    expected = [NestedSubType1(x=i) for i in range(3)]
+    assert decode.decode_many(NestedBaseType, rows, trusted=True) == expected
+    text = io.StringIO("\n".join(json.dumps(row) for row in rows))
+    assert list(decode.decode_iter(NestedBaseType, text, trusted=True)) == expected
+    assert decode.decode_many(Layer, LAYER_ROWS, trusted=True) == decode.decode_many(
+        Layer, LAYER_ROWS
+    )
+
+
+@pytest.fixture(params=["default", "json"])
+def json_backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(sys.modules[Decoder.__module__], "_json_loads", json.loads)
+    return request.param
+
+
+def test_decode_json(json_backend):
+    text = encode.encode_json(TRUSTED_CONFIG)
+    assert decode.decode_json(TrustedConfig, text) == TRUSTED_CONFIG
+    assert decode.decode_json(TrustedConfig, text.encode(), trusted=True) == TRUSTED_CONFIG
+    assert decode.decode_json(NestedBaseType, '{"type": "nested1", "x": 1}') == NestedSubType1(x=1)
+
+    layer = decode.decode_json(Layer, '{"name": "l0", "width": 1, "dropout": NaN}')
+    assert layer.dropout != layer.dropout
+
+
+def test_decode_json_errors(json_backend):
+    with pytest.raises(json.JSONDecodeError):
+        decode.decode_json(Layer, '{"name": "l0",')
+    with pytest.raises(DecodeError, match="has no attribute 'foo'"):
+        decode.decode_json(Layer, b'{"foo": 1}')
+
+
+def test_get_json_loads():
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        assert _get_json_loads() is json.loads
+    else:
+        del orjson
+        assert _get_json_loads() is not json.loads
+        assert _get_json_loads()(b'{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+        assert _get_json_loads()(str(2**70)) == 2**70
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_decode_columnar(trusted: bool):
+    configs = [TRUSTED_CONFIG, dataclasses.replace(TRUSTED_CONFIG, item=None)]
+    columns = encode.encode_columnar(configs)
+    assert decode.decode_columnar(TrustedConfig, columns, trusted=trusted) == configs
+    assert decode.decode_columnar(TrustedConfig, {}) == []
+
+    instances = [NestedSubType1(x=1), NestedSubType1(x=2, y=3)]
+    columns = encode.encode_columnar(instances)
+    assert decode.decode_columnar(NestedBaseType, columns, trusted=trusted) == instances
+
+    columns = {"type": ["nested1", None], "x": [1, 2]}
+    assert decode.decode_columnar(NestedBaseType, columns, trusted=trusted) == [
+        NestedSubType1(x=1),
+        NestedBaseType(x=2),
+    ]
+
+
+def test_decode_columnar_errors():
+    with pytest.raises(DecodeError, match="same length"):
+        decode.decode_columnar(Layer, {"name": ["a"], "width": [1, 2]})
+    with pytest.raises(DecodeError, match="has no attribute 'foo'"):
+        decode.decode_columnar(Layer, {"name": ["a"], "foo": [1]})
+    with pytest.raises(DecodeError, match="Failed to decode Layer"):
+        decode.decode_columnar(Layer, {"name": ["a"]})
+    with pytest.raises(DecodeError) as exc_info:
+        decode.decode_columnar(Layer, {"name": ["a", "b"], "width": [1, "x"]})
+    assert exc_info.value.failures[0].key == "width.1"
+    assert "at key 'width.1'" in str(exc_info.value)
+
+
+@pytest.mark.parametrize(
+    "value, type_hint",
+    [
+        ([1.0, "x"], list[float]),
+        ([1.0, None], tuple[float, ...]),
+        ([1, 1.5], list[int]),
+        ([1, b"1"], list[float]),
+    ],
+)
+def test_decode_numeric_sequence_errors_match(value: Any, type_hint: Any):
+    with pytest.raises(DecodeError) as generic:
+        _coerce(value, type_hint, {}, "values", None)
+    with pytest.raises(DecodeError) as compiled:
+        _compile_coercer(type_hint, None, decode)(value, "values")
+    assert str(compiled.value) == str(generic.value)
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import abc
+import collections
+import collections.abc
 import dataclasses
+import io
+import json
+import math
+import pathlib
 import typing
 from dataclasses import dataclass
 from datetime import datetime
+from enum import Enum
 
 import pytest
 
-from dataclass_extensions.encode import encode
+from dataclass_extensions import Registrable
+from dataclass_extensions.encode import _BULK_COPY_MIN_SIZE, Encoder, encode
 from dataclass_extensions.types import *
 
 
@@ -256,7 +265,6 @@ def test_encode_empty_collections():
 
 def test_encode_nested_registrable():
     """Test encode with nested registrable types."""
-    from dataclass_extensions import Registrable
 
     @dataclass
     class BaseType(Registrable):
@@ -290,3 +298,260 @@ def test_encode_with_non_init_fields():
 
     # Should exclude non-init fields y and z.
     assert encode(Config()) == {"x": 1}
+
+
+def test_encode_plan_is_cached_per_options():
+    @dataclass
+    class Config:
+        x: int | None = None
+        _y: int = 1
+
+    config = Config()
+    assert encode(config) == {"x": None, "_y": 1}
+    assert encode(config, exclude_none=True, exclude_private_fields=True) == {}
+    assert Config in Encoder._plans[(False, False, "raise")]
+    assert Encoder._plans[(True, True, "raise")][Config].field_names == ("x",)
+
+    Encoder.clear_cache()
+    assert Config not in Encoder._plans[(False, False, "raise")]
+    assert encode(config) == {"x": None, "_y": 1}
+
+
+def test_encode_registrable_registered_after_first_encode():
+    @dataclass
+    class BaseType(Registrable):
+        x: int = 0
+
+    @dataclass
+    class SubType(BaseType):
+        pass
+
+    assert encode(SubType()) == {"x": 0}
+    BaseType.register("sub")(SubType)
+    assert encode(SubType()) == {"x": 0, "type": "sub"}
+
+
+def test_encode_dataclass_type():
+    @dataclass
+    class Config:
+        x: int = 1
+
+    assert encode(Config) == {"x": 1}
+
+
+def test_encode_custom_handler_dispatch_cache():
+    class Base:
+        pass
+
+    class Child(Base):
+        pass
+
+    class GrandChild(Child):
+        pass
+
+    encode.register_encoder(lambda _: "base", Base)
+    try:
+        assert encode(GrandChild()) == "base"
+        assert Encoder._dispatch_cache[GrandChild] is encode.custom_handlers[Base]
+
+        # The handler for the closest class in the MRO wins.
+        encode.register_encoder(lambda _: "child", Child)
+        assert GrandChild not in Encoder._dispatch_cache
+        assert encode(GrandChild()) == "child"
+
+        del encode.custom_handlers[Child]
+        assert encode(GrandChild()) == "base"
+    finally:
+        encode.custom_handlers.pop(Base, None)
+        encode.custom_handlers.pop(Child, None)
+
+    with pytest.raises(TypeError, match="not sure how to encode"):
+        encode(GrandChild())
+    assert Encoder._dispatch_cache[GrandChild] is None
+    assert encode(GrandChild(), errors="ignore") is not None
+
+
+def test_encode_custom_handler_for_abc():
+    class Items:
+        def __iter__(self):
+            yield from (1, 2)
+
+    encode.register_encoder(list, collections.abc.Iterable)
+    try:
+        assert encode(Items()) == [1, 2]
+    finally:
+        del encode.custom_handlers[collections.abc.Iterable]
+
+
+def test_encode_custom_handler_for_abc_virtual_subclass():
+    class Shape(abc.ABC):
+        pass
+
+    class Circle:
+        pass
+
+    encode.register_encoder(lambda _: "shape", Shape)
+    try:
+        assert encode(Circle(), errors="stringify") != "shape"
+        assert Encoder._dispatch_cache[Circle] is None
+
+        # Registering a virtual subclass invalidates the cached lookup.
+        Shape.register(Circle)
+        assert encode(Circle()) == "shape"
+    finally:
+        del encode.custom_handlers[Shape]
+    assert Encoder._dispatch_cache_token is None
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"exclude_none": True, "exclude_private_fields": True}, {"errors": "stringify"}],
+)
+def test_encode_json(kwargs):
+    class Color(Enum):
+        RED = "red"
+
+    @dataclass
+    class Base(Registrable):
+        x: int = 0
+
+    @Base.register("sub")
+    @dataclass
+    class Sub(Base):
+        y: float = math.inf
+
+    @dataclass
+    class Config:
+        name: str = 'naïve "quoted"\n'
+        items: list[Base] = dataclasses.field(default_factory=lambda: [Sub(x=1), Base()])
+        mapping: dict = dataclasses.field(default_factory=lambda: {1: None, "a": (1, 2), 2.5: {}})
+        tags: set[str] = dataclasses.field(default_factory=lambda: {"a"})
+        color: Color = Color.RED
+        path: pathlib.Path = pathlib.Path("/tmp/x")
+        time: datetime = datetime(2024, 1, 1)
+        employee: Employee = Employee(name="Bob", id=0)
+        empty: list = dataclasses.field(default_factory=list)
+        nothing: Foo | None = None
+        _private: float = math.nan
+
+    config = Config()
+    expected = json.dumps(encode(config, **kwargs))
+    assert encode.encode_json(config, **kwargs) == expected
+
+    text_fp = io.StringIO()
+    encode.encode_to(config, text_fp, **kwargs)
+    assert text_fp.getvalue() == expected
+
+    bytes_fp = io.BytesIO()
+    encode.encode_to([config] * 5_000, bytes_fp, **kwargs)
+    assert bytes_fp.getvalue().decode() == json.dumps([json.loads(expected)] * 5_000)
+
+
+def test_encode_json_errors():
+    class Unknown:
+        def __str__(self):
+            return "unknown"
+
+    with pytest.raises(TypeError, match="not sure how to encode"):
+        encode.encode_json({"a": Unknown()})
+    assert encode.encode_json({"a": Unknown()}, errors="stringify") == '{"a": "unknown"}'
+    with pytest.raises(TypeError, match="keys must be str"):
+        encode.encode_json({(1, 2): 1})
+
+
+def test_encode_json_custom_handler():
+    class Tensor:
+        def __init__(self, values):
+            self.values = values
+
+    encode.register_encoder(lambda t: t.values, Tensor)
+    try:
+        assert encode.encode_json({"t": Tensor((1, 2))}) == '{"t": [1, 2]}'
+    finally:
+        del encode.custom_handlers[Tensor]
+
+
+def test_encode_columnar():
+    @dataclass
+    class Base(Registrable):
+        x: int
+
+    @Base.register("sub")
+    @dataclass
+    class Sub(Base):
+        foo: Foo | None = None
+        _private: str = "p"
+
+    items = [Sub(x=0), Sub(x=1, foo=Foo(x=2))]
+    assert encode.encode_columnar(items) == {
+        "x": [0, 1],
+        "foo": [None, {"x": 2}],
+        "_private": ["p", "p"],
+        "type": ["sub", "sub"],
+    }
+    assert list(encode.encode_columnar(items, exclude_private_fields=True)) == ["x", "foo", "type"]
+    assert encode.encode_columnar([]) == {}
+
+    with pytest.raises(TypeError, match="same dataclass"):
+        encode.encode_columnar([Sub(x=0), Foo(x=0)])
+    with pytest.raises(TypeError, match="same dataclass"):
+        encode.encode_columnar([1, 2])
+
+
+def test_encode_primitive_containers():
+    class Color(Enum):
+        RED = "red"
+
+    floats = [i / 3 for i in range(100)]
+    mapping = {str(i): i for i in range(100)}
+    for data in (floats, mapping):
+        encoded = encode(data)
+        assert encoded == data and encoded is not data
+        assert encode(data, reuse_containers=True) is data
+
+    assert encode(tuple(floats), reuse_containers=True) == floats
+    assert encode(set(range(10))) == list(range(10))
+    ordered = collections.OrderedDict(mapping)
+    assert type(encode(ordered, reuse_containers=True)) is dict
+    assert encode([1] * 10 + [Color.RED]) == [1] * 10 + ["red"]
+    assert encode({"config": {str(i): None for i in range(10)}}, reuse_containers=True) == {
+        "config": {str(i): None for i in range(10)}
+    }
+
+
+def test_encode_json_primitive_containers():
+    data = {"floats": [i / 3 for i in range(100)] + [float("nan")], "ints": set(range(10))}
+    assert encode.encode_json(data) == json.dumps(encode(data))
+    assert encode.encode_json({i: "x" for i in range(10)}) == json.dumps(
+        {i: "x" for i in range(10)}
+    )
+
+
+def test_encode_primitive_containers_with_primitive_handler():
+    floats = [1.234] * (_BULK_COPY_MIN_SIZE + 2)
+    mapping = {str(i): 1.234 for i in range(_BULK_COPY_MIN_SIZE + 2)}
+    encode.register_encoder(lambda f: round(f, 1), float)
+    try:
+        assert encode(floats[:3]) == [1.2] * 3
+        assert encode(floats) == [1.2] * len(floats)
+        assert encode(floats, reuse_containers=True) == [1.2] * len(floats)
+        assert encode(mapping) == {k: 1.2 for k in mapping}
+        assert encode.encode_json(floats) == str([1.2] * len(floats))
+        assert encode.encode_json(mapping) == json.dumps({k: 1.2 for k in mapping})
+    finally:
+        del encode.custom_handlers[float]
+    assert encode(floats) == floats
+
+
+def test_encode_columnar_with_primitive_handler():
+    @dataclass
+    class Point:
+        x: float = 1.234
+        label: str = "p"
+
+    encode.register_encoder(lambda f: round(f, 1), float)
+    try:
+        assert encode(Point()) == {"x": 1.2, "label": "p"}
+        assert encode.encode_columnar([Point(), Point()]) == {"x": [1.2, 1.2], "label": ["p", "p"]}
+    finally:
+        del encode.custom_handlers[float]
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+
+import pytest
+
+from dataclass_extensions.decode import DecodeError, Decoder, decode
+from dataclass_extensions.encode import encode
+from dataclass_extensions.instrument import (
+    Event,
+    Metrics,
+    add_listener,
+    remove_listener,
+)
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+@dataclass
+class Circle:
+    radius: float
+
+
+@dataclass
+class Square:
+    side: float = 1.0
+    color: str = "black"
+
+
+class Celsius:
+    def __init__(self, degrees: float):
+        self.degrees = degrees
+
+
+@dataclass
+class Drawing:
+    origin: Point
+    shapes: list[Circle | Square]
+    temperature: Celsius | None = None
+
+
+@pytest.fixture
+def events():
+    events: list[Event] = []
+    add_listener(events.append)
+    yield events
+    remove_listener(events.append)
+
+
+@pytest.fixture
+def celsius_handlers():
+    encode.register_encoder(lambda c: c.degrees, Celsius)
+    decode.register_decoder(Celsius, Celsius)
+    yield
+    del encode.custom_handlers[Celsius]
+    del decode.custom_handlers[Celsius]
+
+
+def test_decode_event(events: list[Event]):
+    data = {"origin": {"x": 0, "y": 1}, "shapes": [{"radius": 1.0}, {}]}
+    drawing = decode(Drawing, data)
+    assert drawing.shapes == [Circle(radius=1.0), Square()]
+
+    assert len(events) == 1
+    event = events[0]
+    assert event.operation == "decode"
+    assert event.cls is Drawing
+    assert event.error is None
+    assert event.duration > 0
+    # The top-level dict, 'origin' and its 2 fields, the list, the 2 shapes, and 'radius'.
+    assert event.stats.nodes == 8
+    # 'Circle' was tried first for the empty shape and is missing 'radius'.
+    assert event.stats.union_fallbacks == 1
+    assert event.stats.failed_branches == 1
+    assert event.stats.custom_handler_hits == 0
+
+
+@pytest.mark.parametrize("codegen", [False, True])
+def test_custom_handler_hits(events: list[Event], celsius_handlers, codegen: bool):
+    drawing = Drawing(origin=Point(0, 0), shapes=[], temperature=Celsius(21.5))
+    data = encode(drawing)
+    assert data["temperature"] == 21.5
+    decoded = Decoder(codegen=codegen)(Drawing, data)
+    assert isinstance(decoded.temperature, Celsius)
+
+    assert [event.operation for event in events] == ["encode", "decode"]
+    assert events[0].cls is Drawing
+    assert events[0].stats.custom_handler_hits == 1
+    assert events[1].stats.custom_handler_hits == 1
+
+
+def test_trusted_decode_counts_custom_handler_hits(events: list[Event], celsius_handlers):
+    data = {"origin": {"x": 0, "y": 0}, "shapes": [], "temperature": 21.5}
+    decoded = decode(Drawing, data, trusted=True)
+    assert isinstance(decoded.temperature, Celsius)
+    assert events[0].stats.custom_handler_hits == 1
+
+
+def test_failed_decode_event(events: list[Event]):
+    with pytest.raises(DecodeError):
+        decode(Point, {"x": "not a number", "y": 0})
+
+    assert len(events) == 1
+    assert isinstance(events[0].error, DecodeError)
+    assert events[0].stats.nodes == 0
+
+
+def test_nested_calls_are_part_of_the_outer_call(events: list[Event]):
+    def decode_point(data):
+        return decode(Point, data)
+
+    decode.register_decoder(decode_point, Point)
+    try:
+        decode(Drawing, {"origin": {"x": 0, "y": 1}, "shapes": []})
+    finally:
+        del decode.custom_handlers[Point]
+
+    assert len(events) == 1
+    assert events[0].cls is Drawing
+    assert events[0].stats.custom_handler_hits == 1
+
+
+def test_decode_json_event(events: list[Event]):
+    decode.decode_json(Point, '{"x": 1, "y": 2}')
+    assert len(events) == 1
+    assert events[0].operation == "decode_json"
+    assert events[0].cls is Point
+    assert events[0].stats.nodes == 3
+
+
+def test_no_events_after_remove_listener():
+    events: list[Event] = []
+    add_listener(events.append)
+    encode(Point(0, 0))
+    remove_listener(events.append)
+    encode(Point(0, 0))
+    assert len(events) == 1
+
+    with pytest.raises(ValueError):
+        remove_listener(events.append)
+
+
+def test_metrics():
+    metrics = Metrics(buckets=(1.0, 1e9))
+    add_listener(metrics)
+    try:
+        for i in range(3):
+            encode(Point(i, i))
+        decode(Point, {"x": 0, "y": 0})
+        with pytest.raises(DecodeError):
+            decode(Point, {"x": "x", "y": 0})
+    finally:
+        remove_listener(metrics)
+
+    snapshot = metrics.snapshot()
+    name = f"{Point.__module__}.{Point.__qualname__}"
+    assert set(snapshot) == {("encode", name), ("decode", name)}
+
+    encode_metrics = snapshot[("encode", name)]
+    assert encode_metrics["calls"] == 3
+    assert encode_metrics["errors"] == 0
+    assert encode_metrics["rows"] == 3
+    assert encode_metrics["nodes"] == 9
+    assert sum(encode_metrics["duration_us"]["histogram"]) == 3
+    assert len(encode_metrics["duration_us"]["histogram"]) == 3
+    assert encode_metrics["duration_us"]["max"] <= encode_metrics["duration_us"]["total"]
+
+    decode_metrics = snapshot[("decode", name)]
+    assert decode_metrics["calls"] == 2
+    assert decode_metrics["errors"] == 1
+
+    # Snapshots are copies.
+    encode_metrics["duration_us"]["histogram"][0] += 1
+    assert sum(metrics.snapshot()[("encode", name)]["duration_us"]["histogram"]) == 3
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_batch_and_streaming_events(events: list[Event], tmp_path):
+    points = [Point(0, 1), Point(2, 3)]
+    rows = [{"x": 0, "y": 1}, {"x": 2, "y": 3}]
+
+    assert decode.decode_many(Point, iter(rows)) == points
+    assert decode.decode_columnar(Point, {"x": [0, 2], "y": [1, 3]}) == points
+    path = tmp_path / "points.jsonl"
+    path.write_text('{"x": 0, "y": 1}\n{"x": 2, "y": 3}\n')
+    assert list(decode.decode_iter(Point, path)) == points
+    assert encode.encode_columnar(points) == {"x": [0, 2], "y": [1, 3]}
+    assert encode.encode_json(points) == '[{"x": 0, "y": 1}, {"x": 2, "y": 3}]'
+    encode.encode_to(points, io.StringIO())
+
+    assert [
+        (event.operation, event.cls, event.stats.rows, event.stats.nodes) for event in events
+    ] == [
+        ("decode_many", Point, 2, 7),
+        ("decode_columnar", Point, 2, 7),
+        ("decode_iter", Point, 1, 3),
+        ("decode_iter", Point, 1, 3),
+        ("encode_columnar", Point, 2, 7),
+        ("encode_json", list, 1, 0),
+        ("encode_to", list, 1, 0),
+    ]
+
+
+def test_encode_json_custom_handler_hits(events: list[Event], celsius_handlers):
+    assert encode.encode_json([Celsius(21.5)]) == "[21.5]"
+    assert events[0].stats.custom_handler_hits == 1
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import subprocess
+import sys
 from dataclasses import dataclass, field
+from pathlib import Path
 
 import pytest
+import yaml
 
+import dataclass_extensions
 from dataclass_extensions import Registrable
 from dataclass_extensions.decode import DecodeError, Decoder, decode
-from dataclass_extensions.merge import merge, merge_from_dotlist
+from dataclass_extensions.merge import (
+    _parse_value,
+    compile_overrides,
+    merge,
+    merge_from_dotlist,
+)
 
 
 @dataclass
@@ -495,3 +505,238 @@ def test_merge_registrable():
     c = Config(model=A(x=1))
     c = merge(c, {"model": {"type": "B", "x": 10, "y": 20}})
     assert isinstance(c.model, B)
+
+
+# ---------------------------------------------------------------------------
+# structural merge
+# ---------------------------------------------------------------------------
+
+
+def test_merge_shares_unchanged_nested_instances():
+    original = Level1(level2=Level2(level3=Level3(z=1), w=2), v=3)
+    result = merge(original, {"level2": {"w": 5}})
+    assert result.level2 is not original.level2
+    assert result.level2.level3 is original.level2.level3
+    assert original.level2.w == 2
+
+
+def test_merge_only_coerces_updated_fields():
+    original = Point(x="1", y=2)  # type: ignore[arg-type]
+    result = merge(original, {"y": "3"})
+    assert result.x == "1"
+    assert result.y == 3
+
+
+def test_merge_dict_field_is_merged_recursively():
+    @dataclass
+    class Cfg:
+        params: dict[str, dict[str, int]]
+
+    updates = {"params": {"a": {"c": 3}}}
+    result = merge(Cfg(params={"a": {"b": 1}, "d": {}}), updates)
+    assert result.params == {"a": {"b": 1, "c": 3}, "d": {}}
+    assert updates == {"params": {"a": {"c": 3}}}
+
+
+def test_merge_does_not_modify_updates():
+    first = {"inner": {"a": 10}}
+    second = {"inner": {"b": 20}}
+    result = merge(Outer(inner=Inner(a=1, b=2), tag="v1"), first, second)
+    assert result.inner == Inner(a=10, b=20)
+    assert first == {"inner": {"a": 10}}
+    assert second == {"inner": {"b": 20}}
+
+
+def test_merge_nested_error_key():
+    with pytest.raises(DecodeError) as exc_info:
+        merge(Level1(level2=Level2(level3=Level3(z=1), w=2), v=3), {"level2": {"w": "x"}})
+    assert exc_info.value.failures[0].key == "level2.w"
+
+
+def test_merge_registrable_keeps_type():
+    @dataclass
+    class Config:
+        model: MyBase
+
+    c = merge(Config(model=B(x=1, y=2)), {"model": {"type": "B", "x": 10}})
+    assert c.model == B(x=10, y=2)
+
+    c = merge(Config(model=A(x=1)), {"model": {"type": "B", "y": 5}})
+    assert c.model == B(x=1, y=5)
+
+
+# ---------------------------------------------------------------------------
+# compiled overrides
+# ---------------------------------------------------------------------------
+
+
+def test_compile_overrides():
+    overrides = compile_overrides(Outer, ["inner.a", "tag"])
+    base = Outer(inner=Inner(a=1, b=2), tag="v1")
+    assert overrides.apply(base, [10, "x"]) == Outer(inner=Inner(a=10, b=2), tag="x")
+    assert overrides.apply(base, ["20", "y"]) == Outer(inner=Inner(a=20, b=2), tag="y")
+    assert base == Outer(inner=Inner(a=1, b=2), tag="v1")
+
+
+def test_compile_overrides_bad_path_raises():
+    with pytest.raises(DecodeError, match="has no attribute 'c'"):
+        compile_overrides(Outer, ["inner.c"])
+    with pytest.raises(DecodeError, match="Cannot traverse"):
+        compile_overrides(Outer, ["tag.x"])
+
+
+def test_compile_overrides_overlapping_keys_raises():
+    with pytest.raises(ValueError, match="prefixes"):
+        compile_overrides(Outer, ["inner", "inner.a"])
+
+
+def test_compile_overrides_wrong_number_of_values_raises():
+    with pytest.raises(ValueError, match="Expected 2 values"):
+        compile_overrides(Outer, ["inner.a", "tag"]).apply(Outer(Inner(1, 2), "v1"), [1])
+
+
+def test_compile_overrides_shares_unchanged_nested_instances():
+    original = Level1(level2=Level2(level3=Level3(z=1), w=2), v=3)
+    result = compile_overrides(Level1, ["level2.w"]).apply(original, [5])
+    assert result.level2.w == 5
+    assert result.level2.level3 is original.level2.level3
+
+
+def test_compile_overrides_sequences_and_dicts():
+    @dataclass
+    class Cfg:
+        items: list[Inner]
+        x: tuple[int, str]
+        params: dict[str, int]
+
+    overrides = compile_overrides(Cfg, ["items.-1.b", "x.1", "params.c"])
+    result = overrides.apply(
+        Cfg(items=[Inner(1, 2), Inner(3, 4)], x=(0, "a"), params={"a": 1}), [5, "b", "7"]
+    )
+    assert result == Cfg(items=[Inner(1, 2), Inner(3, 5)], x=(0, "b"), params={"a": 1, "c": 7})
+
+    with pytest.raises(DecodeError, match="out of bounds"):
+        overrides.apply(Cfg(items=[], x=(0, "a"), params={}), [5, "b", 7])
+    with pytest.raises(DecodeError, match="Expected integer index"):
+        compile_overrides(Cfg, ["items.first.b"])
+
+
+def test_compile_overrides_registrable_type():
+    @dataclass
+    class Config:
+        model: MyBase
+        name: str = "run"
+
+    overrides = compile_overrides(Config, ["model.type", "model.y", "name"])
+    result = overrides.apply(Config(model=A(x=1)), ["B", 5, "run2"])
+    assert result == Config(model=B(x=1, y=5), name="run2")
+
+    # Fields of registered subclasses can be overridden too.
+    result = compile_overrides(Config, ["model.y"]).apply(Config(model=B(x=1)), [3])
+    assert result.model == B(x=1, y=3)
+
+
+def test_dotlist_registrable_type_in_sequences_and_dicts():
+    @dataclass
+    class Config:
+        models: list[MyBase]
+        by_name: dict[str, MyBase]
+
+    original = Config(models=[A(x=1)], by_name={"a": A(x=2)})
+    result = merge_from_dotlist(original, "models.0.type=B", "by_name.a.type=B", "by_name.a.y=3")
+    assert result == Config(models=[B(x=1)], by_name={"a": B(x=2, y=3)})
+    assert original == Config(models=[A(x=1)], by_name={"a": A(x=2)})
+
+    # Unknown names fail the same way they do in 'decode()'.
+    with pytest.raises(KeyError, match="not registered"):
+        merge_from_dotlist(original, "models.0.type=C")
+
+
+def test_dotlist_item_coercers_invalidated_by_custom_handlers():
+    @dataclass
+    class Config:
+        wrapped: list[_Wrapped]
+
+    original = Config(wrapped=[_Wrapped(1)])
+    with pytest.raises(DecodeError):
+        merge_from_dotlist(original, "wrapped.0=5")
+
+    decode.register_decoder(lambda v: _Wrapped(v * 10), _Wrapped)
+    try:
+        assert merge_from_dotlist(original, "wrapped.0=5").wrapped[0].v == 50
+    finally:
+        del Decoder.custom_handlers[_Wrapped]
+
+
+def test_dotlist_uses_compiled_overrides_for_nested_fields():
+    original = Level1(level2=Level2(level3=Level3(z=1), w=2), v=3)
+    result = merge_from_dotlist(original, "level2.w=5", "v=4")
+    assert result == Level1(level2=Level2(level3=Level3(z=1), w=5), v=4)
+    assert result.level2.level3 is original.level2.level3
+
+
+# ---------------------------------------------------------------------------
+# dotlist value parsing
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "",
+        "~",
+        "null",
+        "NULL",
+        "true",
+        "False",
+        "yes",
+        "Off",
+        "y",
+        "0",
+        "100",
+        "-7",
+        "+5",
+        "0100",
+        "0x1F",
+        "1_000",
+        "0.001",
+        "-1.5",
+        "1.",
+        "1.0e-4",
+        "1.0e4",
+        "1e-4",
+        ".5",
+        ".inf",
+        "-.inf",
+        "inf",
+        "1:30",
+        "2001-12-14",
+        "run1",
+        "a.b/c-d",
+        "_x",
+        "hello world",
+        "'quoted'",
+        '"1"',
+        "[1, 2]",
+        "{a: 1}",
+        "a: b",
+        "a #b",
+    ],
+)
+def test_parse_value_matches_yaml(raw: str):
+    expected = yaml.safe_load(raw)
+    result = _parse_value(raw)
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+def test_import_does_not_load_yaml():
+    code = "import sys, dataclass_extensions; print('yaml' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(dataclass_extensions.__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
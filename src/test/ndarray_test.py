@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+
+import pytest
+
+from dataclass_extensions.decode import decode
+from dataclass_extensions.encode import encode
+from dataclass_extensions.ndarray import register_ndarray_handlers
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+@dataclass
+class Embedding:
+    name: str
+    vector: np.ndarray  # type: ignore[name-defined]
+
+
+def test_register_ndarray_handlers_without_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    with pytest.raises(ImportError):
+        register_ndarray_handlers()
+
+
+@pytest.mark.skipif(np is None, reason="requires numpy")
+def test_ndarray_handlers():
+    register_ndarray_handlers()
+    try:
+        embedding = Embedding(name="e", vector=np.arange(6, dtype=np.float64).reshape(2, 3))
+        data = encode(embedding)
+        assert data == {"name": "e", "vector": [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]}
+        assert encode(np.float32(1.5)) == 1.5
+        # 'np.float64' and 'np.str_' are subclasses of 'float' and 'str'.
+        for scalar, expected in ((np.float64(1.5), 1.5), (np.str_("a"), "a"), (np.int64(3), 3)):
+            for encoded in (encode(scalar), encode({"x": scalar})["x"], encode([scalar])[0]):
+                assert type(encoded) is type(expected) and encoded == expected
+        assert encode.encode_json([np.float64(1.5), np.str_("a")]) == '[1.5, "a"]'
+
+        decoded = decode(Embedding, data)
+        assert isinstance(decoded.vector, np.ndarray)
+        assert np.array_equal(decoded.vector, embedding.vector)
+
+        with pytest.raises(TypeError, match="list of numbers"):
+            decode(Embedding, {"name": "e", "vector": ["a", "b"]})
+    finally:
+        for handlers in (encode.custom_handlers, decode.custom_handlers):
+            handlers.pop(np.ndarray, None)
+            for t in (np.generic, np.float64, np.str_):
+                handlers.pop(t, None)
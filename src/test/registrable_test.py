@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import pickle
+import sys
+import textwrap
 from dataclasses import dataclass
+from importlib.metadata import EntryPoint
 
 import pytest
 
@@ -272,3 +275,193 @@ class Bar(Foo):
 def test_registrable_is_pickleable():
     bar = pickle.loads(pickle.dumps(Bar(x=10, y="hello", z=3.14)))
     assert isinstance(bar, Bar)
+
+
+def test_register_aliases():
+    @dataclass
+    class BaseType(Registrable):
+        x: int
+
+    @BaseType.register("canonical")
+    @BaseType.register("alias")
+    @dataclass
+    class SubType(BaseType):
+        pass
+
+    assert SubType.registered_name == "canonical"
+    assert SubType.get_registered_name() == "canonical"
+    assert BaseType.get_registered_name(SubType) == "canonical"
+    assert BaseType.get_registered_class("alias") is SubType
+    assert isinstance(BaseType(x=1, type="alias"), SubType)
+    assert encode(decode(BaseType, {"type": "alias", "x": 1})) == {"type": "canonical", "x": 1}
+
+
+def test_register_aliases_encodes_last_name():
+    @dataclass
+    class BaseType(Registrable):
+        x: int
+
+    @BaseType.register("one")
+    @BaseType.register("uno")
+    @dataclass
+    class One(BaseType):
+        pass
+
+    assert encode(One(x=1)) == {"type": "one", "x": 1}
+    assert encode(decode(BaseType, {"type": "uno", "x": 1})) == {"type": "one", "x": 1}
+    assert BaseType.get_registered_name(One) == "one"
+
+    # Registering another name later makes it the encoded name.
+    BaseType.register("eins")(One)
+    assert encode(One(x=1)) == {"type": "eins", "x": 1}
+    assert BaseType.get_registered_name(One) == "eins"
+
+
+def test_register_replaces_name():
+    @dataclass
+    class BaseType(Registrable):
+        x: int
+
+    @BaseType.register("name")
+    @BaseType.register("other")
+    @dataclass
+    class Old(BaseType):
+        pass
+
+    @BaseType.register("name")
+    @dataclass
+    class New(BaseType):
+        pass
+
+    assert BaseType.get_registered_name(New) == "name"
+    assert BaseType.get_registered_name(Old) == "other"
+    assert Old.registered_name == "other"
+
+
+def test_get_registered_name_unregistered_raises():
+    @dataclass
+    class BaseType(Registrable):
+        x: int
+
+    @dataclass
+    class SubType(BaseType):
+        pass
+
+    with pytest.raises(ValueError, match="not a registered subclass"):
+        BaseType.get_registered_name(SubType)
+
+
+@dataclass
+class LazyBase(Registrable):
+    x: int
+
+
+@pytest.fixture
+def lazy_module(tmp_path, monkeypatch):
+    """
+    A module with a subclass of :class:`LazyBase` that hasn't been imported yet.
+    """
+    name = f"_lazy_plugin_{tmp_path.name}"
+    (tmp_path / f"{name}.py").write_text(
+        textwrap.dedent(
+            """
+            from dataclasses import dataclass
+
+            from test.registrable_test import LazyBase
+
+
+            @dataclass
+            class LazyImpl(LazyBase):
+                y: int = 0
+            """
+        )
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    sys.modules.pop(name, None)
+
+
+def test_register_lazy(lazy_module: str):
+    LazyBase.register_lazy(lazy_module, f"{lazy_module}:LazyImpl")
+    assert lazy_module in LazyBase.get_registered_names()
+    assert lazy_module not in sys.modules
+
+    instance = decode(LazyBase, {"type": lazy_module, "x": 1, "y": 2})
+    assert lazy_module in sys.modules
+    assert type(instance).__name__ == "LazyImpl"
+    assert instance == LazyBase.get_registered_class(lazy_module)(x=1, y=2)  # type: ignore
+    assert encode(instance) == {"type": lazy_module, "x": 1, "y": 2}
+
+
+def test_register_lazy_new(lazy_module: str):
+    LazyBase.register_lazy(lazy_module, f"{lazy_module}:LazyImpl")
+    instance = LazyBase(x=1, type=lazy_module)
+    assert type(instance).__name__ == "LazyImpl"
+
+
+def test_register_lazy_encode_before_resolved(lazy_module: str):
+    LazyBase.register_lazy(lazy_module, f"{lazy_module}:LazyImpl")
+    instance = __import__(lazy_module).LazyImpl(x=1)
+    assert encode(instance) == {"type": lazy_module, "x": 1, "y": 0}
+
+
+def test_register_lazy_invalid_target():
+    with pytest.raises(ValueError, match="module:qualname"):
+        LazyBase.register_lazy("invalid", "no_qualname")
+
+
+def test_register_entry_points(lazy_module: str, monkeypatch):
+    entry_points = [EntryPoint(name=lazy_module, value=f"{lazy_module}:LazyImpl", group="plugins")]
+    monkeypatch.setattr(
+        "importlib.metadata.entry_points",
+        lambda group: [ep for ep in entry_points if ep.group == group],
+    )
+    assert LazyBase.register_entry_points("plugins") == [lazy_module]
+    assert lazy_module not in sys.modules
+    assert LazyBase.get_registered_class(lazy_module).__name__ == "LazyImpl"
+
+
+def test_registered_leaf_new():
+    @dataclass
+    class BaseType(Registrable):
+        x: int
+
+    @BaseType.register("leaf")
+    @dataclass
+    class Leaf(BaseType):
+        pass
+
+    assert type(Leaf(x=1)) is Leaf
+    assert type(Leaf(x=1, type="leaf")) is Leaf
+    with pytest.raises(KeyError, match="'other' is not registered name for Leaf"):
+        Leaf(x=1, type="other")
+
+    # Registering a subclass with the leaf brings back the dispatch.
+    @Leaf.register("subleaf", default=True)
+    @dataclass
+    class SubLeaf(Leaf):
+        pass
+
+    assert type(Leaf(x=1, type="subleaf")) is SubLeaf
+    assert type(SubLeaf(x=1)) is SubLeaf
+
+
+def test_registered_leaf_new_with_custom_new():
+    created = []
+
+    class Tracked:
+        def __new__(cls, *args, **kwargs):
+            created.append(cls)
+            return super().__new__(cls)
+
+    @dataclass
+    class BaseType(Registrable, Tracked):
+        x: int
+
+    @BaseType.register("leaf")
+    @dataclass
+    class Leaf(BaseType):
+        pass
+
+    Leaf(x=1)
+    assert created == [Leaf]